@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Asyncio interface with Akai MPK Plus."""
+import asyncio
+import time
+
+import rtmidi
+
+from core.config import CONFIG_LENGTH
+from core.midi_interface import AkaiMPKPlus
+from core.validation import check
+
+
+class AsyncAkaiMPKPlus(AkaiMPKPlus):    # pylint: disable=invalid-overridden-method
+    """Asyncio midi interface for Akai MPK mini plus.
+
+    Replies are handed from the rtmidi thread to the event loop and resolve
+    the futures of the requests waiting on them, nothing sleeps on a thread.
+    """
+
+    def __init__(self,
+                 timeout=AkaiMPKPlus.TIMEOUT,
+                 verify_writes=False,
+                 backend=rtmidi,
+                 device=0,
+                 loop=None):
+        """Init config, event loop and midi connection."""
+        self.loop = loop
+        self._waiters = {}
+        self._write_lock = None
+        super().__init__(timeout, verify_writes, backend, device)
+
+    def _on_midi_in(self, event, data=None):
+        """Hand complete programme dumps to the event loop."""
+        message = event[0]    # strip midi time
+        if self.loop is None or self.loop.is_closed():
+            return
+        if message and message[0] == 240 and len(message) >= CONFIG_LENGTH:
+            self.loop.call_soon_threadsafe(self._deliver, message)
+
+    def _deliver(self, message):
+        """Resolve the oldest request waiting for this programme."""
+        waiters = self._waiters.get(message[7], [])
+        while waiters:
+            future = waiters.pop(0)
+            if not future.done():
+                future.set_result(message)
+                return
+
+    async def send_midi_message(self, out_message, timeout=None):
+        """Send out_message to the midi controler.
+
+        Requests resolve to the matching reply, or None on timeout.
+        Writes resolve to None as soon as they are sent.
+        """
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        if not self.is_request(out_message):
+            if self._write_lock is None:
+                self._write_lock = asyncio.Lock()
+            async with self._write_lock:
+                wait = self._last_write + self.WRITE_INTERVAL - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.mo.send_message(out_message)
+                self._last_write = time.monotonic()
+            self.metrics.record(self.operation(out_message), len(out_message))
+            return None
+
+        future = self.loop.create_future()
+        waiters = self._waiters.setdefault(out_message[12], [])
+        waiters.append(future)
+        start = time.monotonic()
+        self.mo.send_message(out_message)
+        try:
+            in_message = await asyncio.wait_for(future,
+                                                self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timeout('fetch')
+            self.metrics.record('fetch', len(out_message))
+            return None
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters and self._waiters.get(out_message[12]) is waiters:
+                del self._waiters[out_message[12]]
+        self.metrics.record('fetch', len(out_message), len(in_message), time.monotonic() - start)
+        return in_message
+
+    async def get_programme(self, p_i):
+        """Get programme p_i from the midi controller.
+
+        Returns a config dataclass of parsed response.
+        """
+        in_message = await self.send_midi_message(self.request_message(p_i))
+        return self.parse_programme(in_message)
+
+    async def get_programmes(self, programmes=range(1, 9), window=8):
+        """Get several programmes, keeping up to window requests in flight.
+
+        Returns a list of config dataclasses ordered like programmes.
+        """
+        semaphore = asyncio.Semaphore(window)
+
+        async def get_one(p_i):
+            async with semaphore:
+                return await self.get_programme(p_i)
+
+        return list(await asyncio.gather(*(get_one(p_i) for p_i in programmes)))
+
+    async def send_programmes(self, configs, verify=None):
+        """Write each config to the programme slot it names.
+
+        Raises InvalidConfig before sending anything if a config is out of range.
+        With verify, every slot is read back and only the ones that differ
+        are written again, up to VERIFY_RETRIES times with a growing delay.
+        Returns the sorted programme numbers that could not be verified.
+        """
+        configs = list(configs)
+        check(configs)
+        verify = self.verify_writes if verify is None else verify
+        pending = {config.programme: config.serialize() for config in configs}
+        for attempt in range(self.VERIFY_RETRIES + 1):
+            for message in pending.values():
+                if attempt:
+                    self.metrics.retry(self.operation(message))
+                await self.send_midi_message(message)
+            if not verify:
+                return []
+            replies = await asyncio.gather(
+                *(self.send_midi_message(self.request_message(p_i)) for p_i in pending))
+            pending = self.unverified(pending, dict(zip(pending, replies)))
+            if not pending or attempt == self.VERIFY_RETRIES:
+                break
+            await asyncio.sleep(self.backoff(attempt))
+        return sorted(pending)
+
+    async def send_programme(self, config, verify=None):
+        """Write config to the programme slot it names.
+
+        Returns True unless verify is on and the write could not be verified.
+        """
+        return not await self.send_programmes([config], verify)
+
+    async def send_ram(self, config, verify=None):
+        """Write config to RAM without overriding a programme.
+
+        Returns True unless verify is on and the write could not be verified.
+        """
+        config.programme = 0
+        return not await self.send_programmes([config], verify)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Bank files holding every programme of an MPK mini Plus, and optionally its RAM."""
+import struct
+
+from core.config import CONFIG_LENGTH, Config
+
+MAGIC = b'MPKB'
+VERSION = 1
+HEADER = struct.Struct('<4sBB')    # magic, version, programme count, then one slot byte each
+BANK_EXTENSION = '.mpkbank'
+PROGRAMME_EXTENSION = '.mpkminiplus'
+RAM = 0
+SLOTS = range(RAM, 9)
+
+
+def pack_bank(configs):
+    """Pack a dict of configs keyed by slot into bank bytes, slot 0 is RAM."""
+    slots = sorted(configs)
+    if any(slot not in SLOTS for slot in slots):
+        raise ValueError(f'slots must be between {RAM} and 8, got {slots}')
+    chunks = [HEADER.pack(MAGIC, VERSION, len(slots)), bytes(slots)]
+    chunks += [bytes(configs[slot].serialize()) for slot in slots]
+    return b''.join(chunks)
+
+
+def unpack_bank(data, config_class=Config):
+    """Unpack bank bytes into a dict of configs keyed by slot.
+
+    A legacy single programme dump is returned keyed by the programme it names.
+    """
+    if len(data) == CONFIG_LENGTH:
+        config = config_class()
+        config.parse_config(data)
+        return {data[7]: config}
+    if len(data) < HEADER.size:
+        raise ValueError('not an MPK mini Plus bank')
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not an MPK mini Plus bank')
+    start = HEADER.size + count
+    if len(data) != start + count * CONFIG_LENGTH:
+        raise ValueError(f'expected {count} programmes, got {len(data) - start} bytes')
+    if any(slot not in SLOTS for slot in data[HEADER.size:start]):
+        raise ValueError(f'slots must be between {RAM} and 8, got {list(data[HEADER.size:start])}')
+    configs = {}
+    for i, slot in enumerate(data[HEADER.size:start]):
+        config = config_class()
+        config.parse_config(data[start + i * CONFIG_LENGTH:start + (i + 1) * CONFIG_LENGTH])
+        configs[slot] = config
+    return configs
+
+
+def write_bank(path, configs):
+    """Write a dict of configs keyed by slot to path in one write."""
+    data = pack_bank(configs)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def read_bank(path, config_class=Config):
+    """Read a bank or a legacy single programme file in one read."""
+    with open(path, 'rb') as f:
+        return unpack_bank(f.read(), config_class)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Vectorized NumPy codec for stacks of MPK mini Plus programme dumps."""
+from core.config import CONFIG_LENGTH, LAYOUT, RECORD_WIDTHS, LazyConfig
+
+try:
+    import numpy as np
+except ImportError:    # numpy is only needed for batch processing
+    np = None
+
+
+def programme_dtype():
+    """Return the structured dtype naming every field of a dump.
+
+    Values are the raw bytes of the dump, channels are 0 based.
+    """
+    if np is None:
+        raise ImportError('numpy is required for batch processing')
+    names, formats, offsets = [], [], []
+    for name, _, offset, width, kind in LAYOUT:
+        names.append(name)
+        offsets.append(offset)
+        if kind in RECORD_WIDTHS:
+            formats.append(('u1', (width // RECORD_WIDTHS[kind], RECORD_WIDTHS[kind])))
+        elif kind in ('list', 'sparse'):
+            formats.append(('u1', (width, )))
+        else:
+            formats.append('u1')
+    return np.dtype({
+        'names': names,
+        'formats': formats,
+        'offsets': offsets,
+        'itemsize': CONFIG_LENGTH
+    })
+
+
+class ProgrammeBatch():
+    """N programme dumps stored as one (N, 2902) uint8 array.
+
+    fields is a structured view of the same memory, so batch['arp_swing']
+    or batch['pads'][:, 4, 0] read and write every programme at once.
+    """
+
+    def __init__(self, raw):
+        """Wrap raw, an (N, 2902) uint8 array."""
+        dtype = programme_dtype()
+        if raw.ndim != 2 or raw.shape[1] != CONFIG_LENGTH or raw.dtype != np.uint8:
+            raise ValueError(f'expected an (N, {CONFIG_LENGTH}) uint8 array, got {raw.shape}')
+        self.raw = np.ascontiguousarray(raw)
+        self.fields = self.raw.view(dtype).reshape(len(self.raw))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Create a batch from concatenated dumps."""
+        if np is None:
+            raise ImportError('numpy is required for batch processing')
+        if len(data) % CONFIG_LENGTH:
+            raise ValueError(f'{len(data)} bytes is not a multiple of {CONFIG_LENGTH}')
+        raw = np.frombuffer(bytearray(data), dtype=np.uint8)
+        return cls(raw.reshape(-1, CONFIG_LENGTH))
+
+    @classmethod
+    def from_dumps(cls, dumps):
+        """Create a batch from an iterable of dumps as bytes or lists of ints."""
+        return cls.from_bytes(b''.join(bytes(dump) for dump in dumps))
+
+    @classmethod
+    def from_configs(cls, configs):
+        """Create a batch from configs."""
+        return cls.from_dumps(config.serialize() for config in configs)
+
+    @classmethod
+    def from_files(cls, filepaths):
+        """Create a batch from .mpkminiplus files."""
+        dumps = []
+        for filepath in filepaths:
+            with open(filepath, 'rb') as f:
+                dumps.append(f.read())
+        return cls.from_dumps(dumps)
+
+    def __len__(self):
+        """Return the number of programmes."""
+        return len(self.raw)
+
+    def __getitem__(self, name):
+        """Return the view of field name across every programme."""
+        return self.fields[name]
+
+    def __setitem__(self, name, value):
+        """Set field name across every programme."""
+        self.fields[name] = value
+
+    def to_bytes(self):
+        """Return the dumps concatenated."""
+        return self.raw.tobytes()
+
+    def to_dumps(self):
+        """Return a list of dumps as bytes."""
+        return [row.tobytes() for row in self.raw]
+
+    def configs(self):
+        """Return a LazyConfig for every programme."""
+        return [LazyConfig(dump) for dump in self.to_dumps()]
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""SQLite catalogue of the programmes stored in preset, bank, library and .syx files."""
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from functools import partial
+
+from core.bank import BANK_EXTENSION, PROGRAMME_EXTENSION, read_bank
+from core.config import FINGERPRINT_SIZE, LazyConfig
+from core.library import EXTENSION as LIBRARY_EXTENSION
+from core.library import Library
+from core.syx import EXTENSION as SYX_EXTENSION
+from core.syx import iter_programmes
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.mpk_mini_plus_catalogue.sqlite')
+EXTENSIONS = (PROGRAMME_EXTENSION, BANK_EXTENSION, LIBRARY_EXTENSION, SYX_EXTENSION)
+CHUNK_SIZE = 1 << 20
+# programme settings that search accepts as keyword filters
+SETTINGS = ('programme', 'pad_channel', 'key_channel', 'key_octave', 'arp_on', 'arp_mode',
+            'arp_time_div', 'arp_swing', 'arp_octave', 'arp_latch', 'scale_on', 'scale_key',
+            'scale_type', 'chord_on', 'chord_type')
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS programmes (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    {', '.join(f'{name} INTEGER' for name in SETTINGS)}
+);
+CREATE TABLE IF NOT EXISTS knobs (
+    programme_id INTEGER NOT NULL REFERENCES programmes(id) ON DELETE CASCADE,
+    knob INTEGER, cc INTEGER, min INTEGER, max INTEGER, mode INTEGER, name TEXT
+);
+CREATE TABLE IF NOT EXISTS pads (
+    programme_id INTEGER NOT NULL REFERENCES programmes(id) ON DELETE CASCADE,
+    pad INTEGER, note INTEGER, cc INTEGER, pc INTEGER
+);
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT
+);
+CREATE INDEX IF NOT EXISTS programmes_path ON programmes(path);
+CREATE INDEX IF NOT EXISTS programmes_title ON programmes(title);
+CREATE INDEX IF NOT EXISTS programmes_fingerprint ON programmes(fingerprint);
+CREATE INDEX IF NOT EXISTS knobs_cc ON knobs(cc, programme_id);
+CREATE INDEX IF NOT EXISTS knobs_programme ON knobs(programme_id);
+CREATE INDEX IF NOT EXISTS pads_note ON pads(note, programme_id);
+CREATE INDEX IF NOT EXISTS pads_programme ON pads(programme_id);
+"""
+
+
+def _text(data):
+    """Decode a zero padded name."""
+    return bytes(data).rstrip(b'\0').decode('ascii', 'replace')
+
+
+def _like(pattern):
+    """Turn a DRUM* style pattern into a LIKE pattern."""
+    pattern = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return pattern.replace('*', '%').replace('?', '_')
+
+
+def file_hash(path):
+    """Return the content hash of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    with open(path, 'rb') as f:
+        for chunk in iter(partial(f.read, CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def walk(root, skipped):
+    """Yield (path, size, mtime_ns) of every file with one of EXTENSIONS under root.
+
+    Directories and files that cannot be read are appended to skipped as (path, error).
+    """
+    directories = [root]
+    while directories:
+        directory = directories.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(entry.path)
+                        elif entry.name.endswith(EXTENSIONS):
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns
+                    except OSError as e:
+                        skipped.append((entry.path, str(e)))
+        except OSError as e:
+            skipped.append((directory, str(e)))
+
+
+def read_programmes(path):
+    """Yield (position, config) for every programme of a preset, bank, library or .syx file.
+
+    Position is 0 for a single programme, the slot in a bank or .syx file and
+    the index in a library.
+    """
+    if path.endswith(LIBRARY_EXTENSION):
+        with Library(path) as library:
+            for i in range(len(library)):
+                yield i, library[i]
+    elif path.endswith(BANK_EXTENSION):
+        yield from read_bank(path, LazyConfig).items()
+    elif path.endswith(SYX_EXTENSION):
+        with open(path, 'rb') as f:
+            for slot, dump in iter_programmes(f):
+                yield slot, LazyConfig(dump)
+    else:
+        with open(path, 'rb') as f:
+            yield 0, LazyConfig(f.read())
+
+
+def load_programme(path, position):
+    """Read programme position of path as a Config."""
+    for i, config in read_programmes(path):
+        if i == position:
+            return config.to_config()
+    raise KeyError(f'{path} has no programme {position}')
+
+
+@dataclass
+class Scan():
+    """Outcome of indexing directories, skipped holds (path, error) pairs."""
+
+    indexed: int = 0
+    skipped: list = field(default_factory=list)
+
+    def __str__(self):
+        """Summarize the scan."""
+        return f'{self.indexed} programmes indexed, {len(self.skipped)} skipped'
+
+
+@dataclass(frozen=True)
+class Hit():
+    """A programme found by Catalogue.search."""
+
+    path: str
+    position: int
+    title: str
+    fingerprint: str
+
+    def load(self):
+        """Read the programme as a Config."""
+        return load_programme(self.path, self.position)
+
+
+class Catalogue():
+    """Searchable index of programmes, stored in a SQLite database."""
+
+    def __init__(self, path=DEFAULT_PATH, check_same_thread=True):
+        """Open or create the database at path, ':memory:' keeps it in memory.
+
+        check_same_thread=False lets another thread use the catalogue, one at a time.
+        """
+        self.db = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        """Use the catalogue as a context manager."""
+        return self
+
+    def __exit__(self, *exc):
+        """Close the database."""
+        self.close()
+
+    def close(self):
+        """Commit and close the database."""
+        self.db.commit()
+        self.db.close()
+
+    def forget(self, path):
+        """Remove every programme of path."""
+        self.db.execute('DELETE FROM programmes WHERE path = ?', (path, ))
+
+    def add(self, path, position, config):
+        """Index one programme of path."""
+        fingerprint = config.fingerprint()    # before decoding, a LazyConfig hashes its dump
+        cursor = self.db.execute(
+            f'INSERT INTO programmes (path, position, title, fingerprint, {", ".join(SETTINGS)}) '
+            f'VALUES ({", ".join("?" * (len(SETTINGS) + 4))})',
+            (path, position, _text(config.title), fingerprint,
+             *(config[name] for name in SETTINGS)))
+        programme_id = cursor.lastrowid
+        self.db.executemany(
+            'INSERT INTO knobs VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(programme_id, key, knob[0], knob[1], knob[2], knob[3], _text(knob[4:]))
+             for key, knob in config.knobs.items()])
+        self.db.executemany(
+            'INSERT INTO pads VALUES (?, ?, ?, ?, ?)',
+            [(programme_id, key, pad[0], pad[1], pad[2]) for key, pad in config.pads.items()])
+
+    def index_file(self, path):
+        """Replace the programmes of path in the catalogue, returns how many were indexed."""
+        self.forget(path)
+        count = 0
+        for position, config in read_programmes(path):
+            self.add(path, position, config)
+            count += 1
+        return count
+
+    def roots(self):
+        """Return the directories indexed so far."""
+        return [path for path, in self.db.execute('SELECT path FROM roots ORDER BY path')]
+
+    def remove_root(self, root):
+        """Stop refreshing root and forget its files."""
+        prefix = os.path.join(os.path.abspath(root), '')
+        self.db.execute('DELETE FROM roots WHERE path = ?', (prefix, ))
+        self.db.execute('DELETE FROM programmes WHERE substr(path, 1, ?) = ?',
+                        (len(prefix), prefix))
+        self.db.execute('DELETE FROM files WHERE substr(path, 1, ?) = ?', (len(prefix), prefix))
+        self.db.commit()
+
+    def refresh(self, force=False):
+        """Rescan every indexed directory, returns a Scan."""
+        scan = Scan()
+        for root in self.roots():
+            self.index_directory(root, force, scan)
+        return scan
+
+    def index_directory(self, root, force=False, scan=None):
+        """Index the files with one of EXTENSIONS under root that changed since last time.
+
+        root is remembered for refresh. The size, mtime and content hash of every
+        file are kept: files with the same size and mtime are not read, files with
+        the same hash are not parsed and files that disappeared are removed. force
+        parses every file again. Returns a Scan, counting into scan if given, with
+        the files and directories that could not be read.
+        """
+        scan = Scan() if scan is None else scan
+        prefix = os.path.join(os.path.abspath(root), '')
+        self.db.execute('INSERT OR IGNORE INTO roots VALUES (?)', (prefix, ))
+        cached = {
+            path: row
+            for path, *row in self.db.execute(
+                'SELECT path, size, mtime_ns, hash FROM files WHERE substr(path, 1, ?) = ?',
+                (len(prefix), prefix))
+        }
+        skipped = []
+        for path, size, mtime_ns in walk(prefix, skipped):
+            old = cached.pop(path, None)
+            if not force and old is not None and old[:2] == [size, mtime_ns]:
+                continue
+            try:
+                digest = file_hash(path)
+                if force or old is None or old[2] != digest:
+                    scan.indexed += self.index_file(path)
+            except (OSError, ValueError) as e:
+                skipped.append((path, str(e)))
+                self.forget(path)
+                digest = None
+            self.db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)',
+                            (path, size, mtime_ns, digest))
+        unreadable = {path for path, _ in skipped}
+        directories = tuple(os.path.join(path, '') for path in unreadable)
+        for path in cached:
+            if path in unreadable or path.startswith(directories):
+                continue    # still there as far as we know, it just could not be read
+            self.forget(path)
+            self.db.execute('DELETE FROM files WHERE path = ?', (path, ))
+        self.db.commit()
+        scan.skipped += skipped
+        return scan
+
+    def search(self, title=None, knob_cc=None, knob_name=None, pad_note=None, limit=500,
+               **settings):    # pylint: disable=too-many-arguments
+        """Return the Hits matching every given filter.
+
+        title and knob_name take DRUM* style patterns, settings are exact values
+        of the SETTINGS columns, channels are 1 based.
+        """
+        clauses, params = [], []
+        if title:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            params.append(_like(title))
+        if knob_cc is not None:
+            clauses.append('id IN (SELECT programme_id FROM knobs WHERE cc = ?)')
+            params.append(knob_cc)
+        if knob_name:
+            clauses.append("id IN (SELECT programme_id FROM knobs WHERE name LIKE ? ESCAPE '\\')")
+            params.append(_like(knob_name))
+        if pad_note is not None:
+            clauses.append('id IN (SELECT programme_id FROM pads WHERE note = ?)')
+            params.append(pad_note)
+        for name, value in settings.items():
+            if name not in SETTINGS:
+                raise ValueError(f'unknown setting {name}')
+            clauses.append(f'{name} = ?')
+            params.append(value)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        rows = self.db.execute(
+            f'SELECT path, position, title, fingerprint FROM programmes{where} '
+            'ORDER BY title, path, position LIMIT ?', (*params, limit))
+        return [Hit(*row) for row in rows]
@@ -21,19 +21,349 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Config for MPK mini plus."""
-from dataclasses import Field, dataclass, field, fields
+import hashlib
+import operator
+import struct
+from dataclasses import dataclass, field, fields
+from functools import partial
 
+# name, section, offset, width, kind
+LAYOUT = (
+    ('start_sysex', 'header', 0, 7, 'list'),
+    ('programme', 'header', 7, 1, 'byte'),
+    ('title', 'title', 8, 16, 'list'),
+    ('pad_channel', 'misc', 24, 1, 'channel'),
+    ('pad_aftertouch', 'misc', 25, 1, 'byte'),
+    ('key_channel', 'misc', 26, 1, 'channel'),
+    ('key_octave', 'misc', 27, 1, 'byte'),
+    ('key_transpose', 'misc', 28, 1, 'byte'),
+    ('transport', 'misc', 29, 1, 'byte'),
+    ('arp_on', 'arp', 30, 1, 'byte'),
+    ('arp_mode', 'arp', 31, 1, 'byte'),
+    ('arp_time_div', 'arp', 32, 1, 'byte'),
+    ('arp_clock', 'arp', 33, 1, 'byte'),
+    ('arp_latch', 'arp', 34, 1, 'byte'),
+    ('arp_swing', 'arp', 35, 1, 'byte'),
+    ('arp_tempo_taps', 'arp', 36, 1, 'byte'),
+    ('arp_tempo', 'arp', 37, 2, 'list'),
+    ('arp_octave', 'arp', 39, 1, 'byte'),
+    ('arp_gate', 'arp', 40, 1, 'byte'),
+    ('note_repeat_time_div', 'note_repeat', 41, 1, 'byte'),
+    ('note_repeat_on', 'note_repeat', 42, 1, 'byte'),
+    ('cv_trigger_source', 'cv', 43, 1, 'byte'),
+    ('cv_note_priority', 'cv', 44, 1, 'byte'),
+    ('cv_gate_mode', 'cv', 45, 1, 'byte'),
+    ('cv_mod_source', 'cv', 46, 1, 'byte'),
+    ('cv_bend_range', 'cv', 47, 1, 'byte'),
+    ('cv_clock_in_div', 'cv', 48, 1, 'byte'),
+    ('cv_clock_out_div', 'cv', 49, 1, 'byte'),
+    ('scale_on', 'scale', 50, 1, 'byte'),
+    ('scale_key', 'scale', 51, 1, 'byte'),
+    ('scale_type', 'scale', 52, 1, 'byte'),
+    ('scale_non_s_note', 'scale', 53, 1, 'byte'),
+    ('chord_on', 'chord', 54, 1, 'byte'),
+    ('chord_type', 'chord', 55, 1, 'byte'),
+    ('chord_inversion', 'chord', 56, 1, 'byte'),
+    ('joystick_x_mode', 'joystick', 57, 1, 'byte'),
+    ('joystick_x_cc1', 'joystick', 58, 1, 'byte'),
+    ('joystick_x_cc2', 'joystick', 59, 1, 'byte'),
+    ('joystick_y_mode', 'joystick', 60, 1, 'byte'),
+    ('joystick_y_cc1', 'joystick', 61, 1, 'byte'),
+    ('joystick_y_cc2', 'joystick', 62, 1, 'byte'),
+    # 16 pads of note, cc, pg, mode, toggle, on_color, off_color
+    ('pads', 'pads', 63, 112, 'pads'),
+    # 8 knobs of cc, min, max, mode, name
+    ('knobs', 'knobs', 175, 160, 'knobs'),
+    ('sysex_end', 'end', 335, 4, 'list'),
+    ('sysex_pad', 'end', 339, 2562, 'sparse'),
+    ('sysex_final', 'end', 2901, 1, 'byte'),
+)
+CONFIG_LENGTH = 2902
+RECORD_WIDTHS = {'pads': 7, 'knobs': 20}
 
-@dataclass(order=True)
+
+class BufferTable():
+    """Fixed size records of a bytearray keyed from 1, used for pads and knobs."""
+
+    __slots__ = ('buffer', 'start', 'width', 'count', 'shared', 'exported')
+
+    def __init__(self, buffer, start, width, count):
+        """Init a view of count records of width bytes from start."""
+        self.buffer = buffer
+        self.start = start
+        self.width = width
+        self.count = count
+        self.shared = False
+        self.exported = False    # writable records were handed out
+
+    @classmethod
+    def from_records(cls, records, width):
+        """Create a table over a new bytearray from a dict of records."""
+        data = bytearray(_join_records(records))
+        return cls(data, 0, width, len(data) // width)
+
+    def clone(self):
+        """Return a table sharing the buffer, whichever of the two writes first copies it.
+
+        A table that handed out writable records cannot know who still writes
+        through them, its clone gets a copy instead.
+        """
+        if self.exported:
+            return BufferTable(bytearray(self.tobytes()), 0, self.width, self.count)
+        self.shared = True
+        clone = BufferTable(self.buffer, self.start, self.width, self.count)
+        clone.shared = True
+        return clone
+
+    def _detach(self):
+        """Copy a shared buffer before handing out writable records."""
+        if self.shared:
+            self.buffer = bytearray(self.tobytes())
+            self.start = 0
+            self.shared = False
+            self.exported = False
+
+    def _bounds(self, key):
+        if not 1 <= key <= self.count:
+            raise KeyError(key)
+        bot = self.start + (key - 1) * self.width
+        return bot, bot + self.width
+
+    def __getitem__(self, key):
+        """Return record key as a writable memoryview."""
+        self._detach()
+        bot, top = self._bounds(key)
+        self.exported = True
+        return memoryview(self.buffer)[bot:top]
+
+    def _read(self, key):
+        """Return record key as a read only memoryview, without copying a shared buffer."""
+        bot, top = self._bounds(key)
+        return memoryview(self.buffer)[bot:top].toreadonly()
+
+    def __setitem__(self, key, value):
+        """Overwrite record key."""
+        if len(value) != self.width:
+            raise ValueError(f'expected {self.width} values, got {len(value)}')
+        self._detach()
+        bot, top = self._bounds(key)
+        self.buffer[bot:top] = bytes(value)
+
+    def __eq__(self, other):
+        """Compare the records."""
+        if not isinstance(other, BufferTable):
+            return NotImplemented
+        return self.width == other.width and self.tobytes() == other.tobytes()
+
+    def __repr__(self):
+        """Show the records as lists."""
+        return f'BufferTable({dict((key, list(value)) for key, value in self.items())})'
+
+    def __len__(self):
+        """Return the number of records."""
+        return self.count
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(range(1, self.count + 1))
+
+    def keys(self):
+        """Return the keys."""
+        return range(1, self.count + 1)
+
+    def values(self):
+        """Return a read only view of every record, write through __getitem__."""
+        return [self._read(key) for key in self.keys()]
+
+    def items(self):
+        """Return (key, read only record) pairs."""
+        return [(key, self._read(key)) for key in self.keys()]
+
+    def tobytes(self):
+        """Return the records as bytes."""
+        return bytes(self.buffer[self.start:self.start + self.width * self.count])
+
+
+def _split_records(data, width):
+    """Copy data into a table of width byte records keyed from 1."""
+    return BufferTable(bytearray(data), 0, width, len(data) // width)
+
+
+def _as_list(data):
+    """Return data as a list, slices of a list already are new lists."""
+    return data if isinstance(data, list) else list(data)
+
+
+def _join_records(records):
+    """Join a table or a dict of records back into bytes."""
+    if isinstance(records, BufferTable):
+        return records.tobytes()
+    return b''.join(bytes(record) for record in records.values())
+
+
+def _sparse(data):
+    """Return the non zero bytes of data as a dict keyed by index."""
+    if not any(data):
+        return {}
+    return {i: value for i, value in enumerate(data) if value}
+
+
+def _expand_sparse(sparse):
+    """Regenerate the padding from its non zero bytes."""
+    if not sparse:
+        return ZERO_PAD
+    data = bytearray(ZERO_PAD)
+    for i, value in sparse.items():
+        data[i] = value
+    return bytes(data)
+
+
+ZERO_PAD = bytes(next(width for name, _, _, width, _ in LAYOUT if name == 'sysex_pad'))
+
+KINDS = {
+    # kind: (decode, encode)
+    'byte': (int, int),
+    'channel': (lambda value: value + 1, lambda value: value - 1),
+    'list': (_as_list, bytes),
+    'pads': (partial(_split_records, width=RECORD_WIDTHS['pads']), _join_records),
+    'knobs': (partial(_split_records, width=RECORD_WIDTHS['knobs']), _join_records),
+    'sparse': (_sparse, _expand_sparse),
+}
+
+
+# kind: copy function of a field value, fields of other kinds are immutable
+CLONE_KINDS = {
+    'list': list,
+    'pads': BufferTable.clone,
+    'knobs': BufferTable.clone,
+    'sparse': dict,
+}
+
+
+def _compile_layout(layout):
+    """Compile layout into a struct and per field encoders, and a slice map of decoders.
+
+    The decoders are also returned grouped by section.
+    """
+    fmt, position = '<', 0
+    decoders, encoders, sections = [], [], {}
+    for name, section, offset, width, kind in layout:
+        if offset != position:
+            raise ValueError(f'{name} starts at {offset}, expected {position}')
+        scalar = kind in ('byte', 'channel')
+        fmt += 'B' if scalar else f'{width}s'
+        decode, encode = KINDS[kind]
+        decoders.append((name, decode, offset if scalar else slice(offset, offset + width)))
+        encoders.append((name, encode))
+        sections.setdefault(section, []).append(decoders[-1])
+        position += width
+    if position != CONFIG_LENGTH:
+        raise ValueError(f'layout is {position} bytes, expected {CONFIG_LENGTH}')
+    return struct.Struct(fmt), tuple(decoders), tuple(encoders), sections
+
+
+CODEC, DECODERS, ENCODERS, SECTION_DECODERS = _compile_layout(LAYOUT)
+FIELD_SECTIONS = {name: section for name, section, *_ in LAYOUT}
+KIND_OF = {name: kind for name, _, _, _, kind in LAYOUT}
+
+
+def _section_spans(layout):
+    """Return the byte ranges of each section.
+
+    The SysEx header and programme byte are left out, a dump read back from the
+    controller carries a different command byte than the one written to it.
+    """
+    spans = {}
+    for name, section, offset, width, _ in layout:
+        if name in ('start_sysex', 'programme'):
+            continue
+        ranges = spans.setdefault(section, [])
+        if ranges and ranges[-1][1] == offset:
+            ranges[-1] = (ranges[-1][0], offset + width)
+        else:
+            ranges.append((offset, offset + width))
+    return spans
+
+
+SECTION_SPANS = _section_spans(LAYOUT)
+CONTENT_SPANS = _section_spans((name, 'content', offset, width, kind)
+                               for name, _, offset, width, kind in LAYOUT)['content']
+FINGERPRINT_SIZE = 16
+
+
+def _digest(view, spans):
+    """Hash the spans of view."""
+    digest = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    for start, stop in spans:
+        digest.update(view[start:stop])
+    return digest.hexdigest()
+
+
+def hash_dump(data):
+    """Return the content hash of a dump, the same whatever its header and slot."""
+    return _digest(memoryview(data if isinstance(data, (bytes, bytearray)) else bytes(data)),
+                   CONTENT_SPANS)
+
+
+def hash_sections(data):
+    """Return the content hash of each section of a dump."""
+    view = memoryview(data if isinstance(data, (bytes, bytearray)) else bytes(data))
+    return {section: _digest(view, spans) for section, spans in SECTION_SPANS.items()}
+
+
+DEFAULT_START_SYSEX = (240, 71, 127, 84, 100, 22, 78)
+DEFAULT_TITLE = (82, 80, 82, 49, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+DEFAULT_ARP_TEMPO = (0, 120)
+# note, cc, pg, mode, toggle, on_color, off_color
+DEFAULT_PADS = _join_records({
+    1: [36, 1, 0, 2, 1, 6, 24],
+    2: [37, 2, 1, 2, 1, 6, 24],
+    3: [38, 3, 2, 2, 1, 6, 24],
+    4: [39, 4, 3, 2, 1, 6, 24],
+    5: [40, 5, 4, 2, 1, 6, 24],
+    6: [41, 6, 5, 2, 1, 6, 24],
+    7: [42, 7, 6, 2, 1, 6, 24],
+    8: [43, 8, 7, 2, 1, 6, 24],
+    9: [44, 9, 8, 2, 1, 1, 28],
+    10: [45, 10, 9, 2, 1, 1, 28],
+    11: [46, 11, 10, 2, 1, 1, 28],
+    12: [47, 12, 11, 2, 1, 1, 28],
+    13: [48, 13, 12, 2, 1, 1, 28],
+    14: [49, 14, 13, 2, 1, 1, 28],
+    15: [50, 15, 14, 2, 1, 1, 28],
+    16: [51, 16, 15, 2, 1, 1, 28]
+})
+# cc, min, max, mode, name
+DEFAULT_KNOBS = _join_records({
+    1: [16, 0, 127, 1, 81, 76, 73, 78, 75, 49, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    2: [17, 0, 127, 1, 81, 76, 73, 78, 75, 50, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    3: [18, 0, 127, 1, 81, 76, 73, 78, 75, 51, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    4: [19, 0, 127, 1, 81, 76, 73, 78, 75, 52, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    5: [20, 0, 127, 1, 81, 76, 73, 78, 75, 53, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    6: [21, 0, 127, 1, 81, 76, 73, 78, 75, 54, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    7: [22, 0, 127, 1, 81, 76, 73, 78, 75, 55, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    8: [23, 0, 127, 1, 81, 76, 73, 78, 75, 56, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+})
+DEFAULT_SYSEX_END = (16, 0, 2, 9)
+# shared by every default config until it writes to its pads or knobs
+TEMPLATE_PADS = _split_records(DEFAULT_PADS, RECORD_WIDTHS['pads'])
+TEMPLATE_KNOBS = _split_records(DEFAULT_KNOBS, RECORD_WIDTHS['knobs'])
+
+
+@dataclass(order=True, slots=True)
 class Config():    # pylint: disable=too-many-instance-attributes
-    """Dataclass reperestation of MPK mini Plus config."""
+    """Dataclass reperestation of MPK mini Plus config.
+
+    Pads and knobs are BufferTables over one bytearray each, sysex_pad only
+    keeps its non zero bytes and is regenerated by serialize.
+    """
 
-    start_sysex: list[int] = field(default_factory=list)
+    start_sysex: list[int] = field(default_factory=partial(list, DEFAULT_START_SYSEX))
     programme: int = 1
-    title: list[int] = field(default_factory=list)
-    pad_channel: int = 1
+    title: list[int] = field(default_factory=partial(list, DEFAULT_TITLE))
+    pad_channel: int = 2
     pad_aftertouch: int = 0
-    key_channel: int = 0
+    key_channel: int = 1
     key_octave: int = 4
     key_transpose: int = 12
     transport: int = 0
@@ -44,7 +374,7 @@ class Config():    # pylint: disable=too-many-instance-attributes
     arp_latch: int = 0
     arp_swing: int = 0
     arp_tempo_taps: int = 3
-    arp_tempo: list[int] = field(default_factory=list)
+    arp_tempo: list[int] = field(default_factory=partial(list, DEFAULT_ARP_TEMPO))
     arp_octave: int = 0
     arp_gate: int = 50
     note_repeat_time_div: int = 4
@@ -69,10 +399,10 @@ class Config():    # pylint: disable=too-many-instance-attributes
     joystick_y_mode: int = 2
     joystick_y_cc1: int = 15
     joystick_y_cc2: int = 15
-    pads: dict[int:list[int]] = field(default_factory=dict)
-    knobs: dict[int:list[int]] = field(default_factory=dict)
-    sysex_end: list[int] = field(default_factory=list)
-    sysex_pad: list[int] = field(default_factory=list)
+    pads: BufferTable = field(default_factory=TEMPLATE_PADS.clone)
+    knobs: BufferTable = field(default_factory=TEMPLATE_KNOBS.clone)
+    sysex_end: list[int] = field(default_factory=partial(list, DEFAULT_SYSEX_END))
+    sysex_pad: dict[int, int] = field(default_factory=dict)
     sysex_final: int = 247
 
     def add_values(self, values):
@@ -80,140 +410,244 @@ class Config():    # pylint: disable=too-many-instance-attributes
         for key, value in values.items():
             if isinstance(value, bool):
                 value = 1 if value else 0
+            elif key in RECORD_WIDTHS and not isinstance(value, BufferTable):
+                value = BufferTable.from_records(value, RECORD_WIDTHS[key])
             object.__setattr__(self, key, value)
 
-    def __init__(self):
-        """Initiate lists and dicts."""
-        self.start_sysex = [240, 71, 127, 84, 100, 22, 78]
-        self.title = [82, 80, 82, 49, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-        self.arp_tempo = [0, 120]
-        # note, cc, pg, mode, toggle, on_color, off_color
-        self.pads = {
-            1: [36, 1, 0, 2, 1, 6, 24],
-            2: [37, 2, 1, 2, 1, 6, 24],
-            3: [38, 3, 2, 2, 1, 6, 24],
-            4: [39, 4, 3, 2, 1, 6, 24],
-            5: [40, 5, 4, 2, 1, 6, 24],
-            6: [41, 6, 5, 2, 1, 6, 24],
-            7: [42, 7, 6, 2, 1, 6, 24],
-            8: [43, 8, 7, 2, 1, 6, 24],
-            9: [44, 9, 8, 2, 1, 1, 28],
-            10: [45, 10, 9, 2, 1, 1, 28],
-            11: [46, 11, 10, 2, 1, 1, 28],
-            12: [47, 12, 11, 2, 1, 1, 28],
-            13: [48, 13, 12, 2, 1, 1, 28],
-            14: [49, 14, 13, 2, 1, 1, 28],
-            15: [50, 15, 14, 2, 1, 1, 28],
-            16: [51, 16, 15, 2, 1, 1, 28]
-        }
-        # cc, min, max, mode, name
-        self.knobs = {
-            1: [16, 0, 127, 1, 81, 76, 73, 78, 75, 49, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            2: [17, 0, 127, 1, 81, 76, 73, 78, 75, 50, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            3: [18, 0, 127, 1, 81, 76, 73, 78, 75, 51, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            4: [19, 0, 127, 1, 81, 76, 73, 78, 75, 52, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            5: [20, 0, 127, 1, 81, 76, 73, 78, 75, 53, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            6: [21, 0, 127, 1, 81, 76, 73, 78, 75, 54, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            7: [22, 0, 127, 1, 81, 76, 73, 78, 75, 55, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            8: [23, 0, 127, 1, 81, 76, 73, 78, 75, 56, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-        }
-        self.sysex_end = [16, 0, 2, 9]
-        self.sysex_pad = [0] * 2562
+    def __getitem__(self, key):
+        """Implement __getitem__."""
+        return getattr(self, key)
+
+    def clone(self):
+        """Return a copy sharing the pads and knobs buffers until one of the two writes to them."""
+        return Config(*[value if clone is None else clone(value)
+                        for value, clone in zip(_FIELD_GETTER(self), _CLONERS)])
+
+    def tobytes(self):
+        """Serialize the config into bytes."""
+        return CODEC.pack(*[encode(getattr(self, name)) for name, encode in ENCODERS])
+
+    def serialize(self):
+        """Serialize the config into a list of ints."""
+        return list(self.tobytes())
+
+    def fingerprint(self):
+        """Return the content hash of the config, ignoring its header and slot."""
+        return hash_dump(self.tobytes())
+
+    def section_fingerprints(self):
+        """Return the content hash of each section of the config."""
+        return hash_sections(self.tobytes())
+
+    def parse_config(self, config):
+        """Parse a config from a list of ints."""
+        if len(config) != CONFIG_LENGTH:
+            raise ValueError(f'expected {CONFIG_LENGTH} bytes, got {len(config)}')
+        for name, decode, key in DECODERS:
+            setattr(self, name, decode(config[key]))
+
+
+_FIELD_GETTER = operator.attrgetter(*(item.name for item in fields(Config)))
+_CLONERS = tuple(CLONE_KINDS.get(KIND_OF[item.name]) for item in fields(Config))
+
+
+class _ByteField():    # pylint: disable=too-few-public-methods
+    """One byte of a ConfigBuffer, shift is added when reading."""
+
+    def __init__(self, offset, shift=0):
+        self.offset = offset
+        self.shift = shift
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.buffer[self.offset] + self.shift
+
+    def __set__(self, obj, value):
+        obj.buffer[self.offset] = int(value) - self.shift
+
+
+class _SliceField():    # pylint: disable=too-few-public-methods
+    """A run of bytes of a ConfigBuffer, read as a writable memoryview."""
+
+    def __init__(self, start, stop):
+        self.start = start
+        self.stop = stop
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return memoryview(obj.buffer)[self.start:self.stop]
+
+    def __set__(self, obj, value):
+        if len(value) != self.stop - self.start:
+            raise ValueError(f'expected {self.stop - self.start} values, got {len(value)}')
+        obj.buffer[self.start:self.stop] = bytes(value)
+
+
+class ConfigBuffer():    # pylint: disable=too-many-instance-attributes
+    """MPK mini Plus config stored as the 2902 byte SysEx dump itself.
+
+    Attributes read and write the bytes at their offset in buffer, channels
+    are 1 based like Config.parse_config. Lists and pad and knob records are
+    memoryviews into buffer, nothing is copied until a value is changed.
+    """
+
+    LENGTH = CONFIG_LENGTH
+
+    _TEMPLATE = None
+
+    def __init__(self, data=None, copy=True):
+        """Init from a dump, or from the default config if data is None.
+
+        A bytearray passed with copy=False is used as the buffer directly.
+        """
+        if data is None:
+            if ConfigBuffer._TEMPLATE is None:
+                ConfigBuffer._TEMPLATE = bytes(Config().serialize())
+            data = ConfigBuffer._TEMPLATE
+        if len(data) != self.LENGTH:
+            raise ValueError(f'expected {self.LENGTH} bytes, got {len(data)}')
+        self.buffer = data if not copy and isinstance(data, bytearray) else bytearray(data)
+        for name, _, offset, width, kind in LAYOUT:
+            if kind in RECORD_WIDTHS:
+                setattr(self, name,
+                        BufferTable(self.buffer, offset, RECORD_WIDTHS[kind],
+                                    width // RECORD_WIDTHS[kind]))
 
     def __getitem__(self, key):
         """Implement __getitem__."""
-        return super().__getattribute__(key)
+        return getattr(self, key)
+
+    def add_values(self, values):
+        """Add values from dict."""
+        for key, value in values.items():
+            if isinstance(value, bool):
+                value = 1 if value else 0
+            if key in ('pads', 'knobs'):
+                table = getattr(self, key)
+                for i, record in value.items():
+                    table[i] = record
+            else:
+                setattr(self, key, value)
+
+    def parse_config(self, config):
+        """Copy a dump into the buffer."""
+        if len(config) != self.LENGTH:
+            raise ValueError(f'expected {self.LENGTH} bytes, got {len(config)}')
+        self.buffer[:] = bytes(config)
+
+    def serialize(self):
+        """Return the buffer, ready for rtmidi or a file write."""
+        return self.buffer
+
+    def fingerprint(self):
+        """Return the content hash of the config, ignoring its header and slot."""
+        return hash_dump(self.buffer)
+
+    def section_fingerprints(self):
+        """Return the content hash of each section of the config."""
+        return hash_sections(self.buffer)
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a buffer config from a Config."""
+        return cls(bytes(config.serialize()), copy=False)
+
+    def to_config(self):
+        """Decode the buffer into a Config."""
+        config = Config()
+        config.parse_config(list(self.buffer))
+        return config
+
+
+for _name, _, _offset, _width, _kind in LAYOUT:
+    if _kind in ('byte', 'channel'):
+        setattr(ConfigBuffer, _name, _ByteField(_offset, 1 if _kind == 'channel' else 0))
+    elif _kind in ('list', 'sparse'):
+        setattr(ConfigBuffer, _name, _SliceField(_offset, _offset + _width))
+
+
+class LazyConfig():
+    """MPK mini Plus config decoding a section of its dump the first time it is used.
+
+    Sections are the second column of LAYOUT. Reading or writing a field
+    decodes its whole section once and caches it, serialize copies the
+    sections that were never decoded straight from the dump.
+    """
+
+    def __init__(self, data=None):
+        """Init from a dump, or from the default config if data is None."""
+        if data is None:
+            data = ConfigBuffer().buffer
+        self.parse_config(data)
+
+    def __getattr__(self, name):
+        """Decode the section of name the first time it is read."""
+        section = FIELD_SECTIONS.get(name)
+        if section is None or section in self.__dict__['_decoded']:
+            raise AttributeError(name)
+        self.decode_section(section)
+        return self.__dict__[name]
+
+    def __setattr__(self, name, value):
+        """Decode the section of name before overwriting it."""
+        section = FIELD_SECTIONS.get(name)
+        if section is not None and section not in self._decoded:
+            self.decode_section(section)
+        super().__setattr__(name, value)
+
+    def __getitem__(self, key):
+        """Implement __getitem__."""
+        return getattr(self, key)
+
+    def decode_section(self, section):
+        """Decode every field of section from the dump."""
+        raw = self.__dict__['raw']
+        for name, decode, key in SECTION_DECODERS[section]:
+            self.__dict__[name] = decode(raw[key])
+        self._decoded.add(section)
+
+    def add_values(self, values):
+        """Add values from dict."""
+        for key, value in values.items():
+            if isinstance(value, bool):
+                value = 1 if value else 0
+            setattr(self, key, value)
+
+    def parse_config(self, config):
+        """Keep a dump and forget every decoded section."""
+        if len(config) != CONFIG_LENGTH:
+            raise ValueError(f'expected {CONFIG_LENGTH} bytes, got {len(config)}')
+        for name in FIELD_SECTIONS:
+            self.__dict__.pop(name, None)
+        self.__dict__['raw'] = config
+        self.__dict__['_decoded'] = set()
 
     def serialize(self):
         """Serialize the config into a list of ints."""
-        conf_fields: tuple[Field, ...] = fields(self.__class__)
-        output: list[int] = []
-        for value in conf_fields:
-            if value.name in ('start_sysex', 'title', 'arp_tempo', 'pads', 'knobs', 'sysex_end',
-                              'sysex_pad'):
-                value = getattr(self, value.name)
-                if isinstance(value, list):
-                    for i in value:
-                        output.append(i)
-                else:
-                    for i in value.values():
-                        for x in i:
-                            output.append(x)
+        if not self._decoded:
+            return list(self.raw)
+        values = []
+        for (name, decode, key), (_, encode) in zip(DECODERS, ENCODERS):
+            if FIELD_SECTIONS[name] in self._decoded:
+                values.append(encode(self.__dict__[name]))
+            elif isinstance(key, slice):
+                values.append(bytes(self.raw[key]))
             else:
-                output.append(getattr(self, value.name))
-        return output
+                values.append(self.raw[key])
+        return list(CODEC.pack(*values))
 
-    def parse_config(self, config):    # pylint: disable=too-many-statements
-        """Parse a config from a list of ints."""
-        # sysex 0:8
-        self.start_sysex = config[0:7]
-        self.programme = config[7]
-        # title 8:24 done
-        self.title = config[8:24]
-        # misc 24:30 done
-        self.pad_channel = config[24] + 1
-        self.pad_aftertouch = config[25]
-        self.key_channel = config[26] + 1
-        self.key_octave = config[27]
-        self.key_transpose = config[28]
-        self.transport = config[29]
-        # arp 30:41 doneo
-        self.arp_on = config[30]
-        self.arp_mode = config[31]
-        self.arp_time_div = config[32]
-        self.arp_clock = config[33]
-        self.arp_latch = config[34]
-        self.arp_swing = config[35]
-        self.arp_tempo_taps = config[36]
-        self.arp_tempo = config[37:39]
-        self.arp_octave = config[39]
-        self.arp_gate = config[40]
-        # repeat 41:43 done
-        self.note_repeat_time_div = config[41]
-        self.note_repeat_on = config[42]
-        # cv 43:50 done
-        self.cv_trigger_source = config[43]
-        self.cv_note_priority = config[44]
-        self.cv_gate_mode = config[45]
-        self.cv_mod_source = config[46]
-        self.cv_bend_range = config[47]
-        self.cv_clock_in_div = config[48]
-        self.cv_clock_out_div = config[49]
-        # scale 50:54 done
-        self.scale_on = config[50]
-        self.scale_key = config[51]
-        self.scale_type = config[52]
-        self.scale_non_s_note = config[53]
-        # chord 54:57 done
-        self.chord_on = config[54]
-        self.chord_type = config[55]
-        self.chord_inversion = config[56]
-        # joystick 57:63 done
-        self.joystick_x_mode = config[57]
-        self.joystick_x_cc1 = config[58]
-        self.joystick_x_cc2 = config[59]
-        self.joystick_y_mode = config[60]
-        self.joystick_y_cc1 = config[61]
-        self.joystick_y_cc2 = config[62]
-        # pads 63:175
-        pads = config[63:175]
-        new_pads = {}
-        bot, top = 0, 7
-        for i in range(0, 16):
-            new_pads[i] = pads[bot:top]
-            bot, top = top, top + 7
-        self.pads = new_pads
-
-        # knobs 175:335
-        knobs = config[175:335]
-        new_knobs = {}
-        bot, top = 0, 20
-        for i in range(0, 8):
-            new_knobs[i + 1] = knobs[bot:top]
-            bot, top = top, top + 20
-        self.knobs = new_knobs
-
-        # end 335:
-        self.sysex_end = config[335:339]
-        self.sysex_pad = config[339:-1]
-        self.sysex_final = config[-1]
+    def fingerprint(self):
+        """Return the content hash of the config, ignoring its header and slot."""
+        return hash_dump(self.raw if not self._decoded else self.serialize())
+
+    def section_fingerprints(self):
+        """Return the content hash of each section of the config."""
+        return hash_sections(self.raw if not self._decoded else self.serialize())
+
+    def to_config(self):
+        """Decode every section into a Config."""
+        config = Config()
+        config.parse_config(self.serialize())
+        return config
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Headless bulk conversion of preset files, run with python -m core.convert."""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from core.bank import PROGRAMME_EXTENSION
+from core.config import Config
+from core.library import EXTENSION as LIBRARY_EXTENSION
+from core.library import write_library
+from core.syx import EXTENSION as SYX_EXTENSION
+from core.syx import iter_programmes
+from core.validation import check
+
+EXTENSIONS = (PROGRAMME_EXTENSION, SYX_EXTENSION)
+TITLE_LENGTH = 16
+
+
+@dataclass(frozen=True)
+class Normalize():
+    """Changes applied to every converted programme, None leaves a field alone.
+
+    title is a format string of the source file stem and the programme position,
+    counted from 1 within the file.
+    """
+
+    pad_channel: int = None
+    key_channel: int = None
+    title: str = None
+
+    def apply(self, config, stem, position):
+        """Normalize config in place."""
+        if self.pad_channel is not None:
+            config.pad_channel = self.pad_channel
+        if self.key_channel is not None:
+            config.key_channel = self.key_channel
+        if self.title is not None:
+            title = self.title.format(stem=stem, position=position).encode('ascii', 'replace')
+            config.title = list(title[:TITLE_LENGTH].ljust(TITLE_LENGTH, b'\0'))
+
+
+@dataclass(frozen=True)
+class Result():
+    """Outcome of converting one file, error is None on success."""
+
+    path: str
+    dumps: tuple = ()
+    error: str = None
+
+
+def convert_file(path, normalize):
+    """Parse, normalize and validate every programme of path, run in a worker process."""
+    try:
+        with open(path, 'rb') as f:
+            if path.endswith(SYX_EXTENSION):
+                dumps = [dump for _, dump in iter_programmes(f)]
+            else:
+                dumps = [f.read()]
+        if not dumps:
+            raise ValueError('no programme found')
+        stem = os.path.splitext(os.path.basename(path))[0]
+        configs = []
+        for position, dump in enumerate(dumps, 1):
+            config = Config()
+            config.parse_config(dump)
+            normalize.apply(config, stem, position)
+            configs.append(config)
+        check(configs)
+        return Result(path, tuple(config.tobytes() for config in configs))
+    except (OSError, ValueError, TypeError) as e:
+        return Result(path, error=str(e) or type(e).__name__)
+
+
+def find_files(root):
+    """Yield the preset and .syx files under root in a stable order."""
+    for directory, directories, filenames in os.walk(root):
+        directories.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(EXTENSIONS):
+                yield os.path.join(directory, filename)
+
+
+def convert(paths, normalize=Normalize(), workers=None, window=64):
+    """Yield a Result for every path, in order, keeping at most window files in flight."""
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append(executor.submit(convert_file, path, normalize))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class Report():
+    """Throughput and failures of a conversion."""
+
+    def __init__(self):
+        """Start the clock."""
+        self.start = time.perf_counter()
+        self.files = 0
+        self.programmes = 0
+        self.failures = []
+
+    def add(self, result):
+        """Count a result, printing failures as they happen."""
+        self.files += 1
+        self.programmes += len(result.dumps)
+        if result.error is not None:
+            self.failures.append((result.path, result.error))
+            print(f'{result.path}: {result.error}', file=sys.stderr)
+
+    def __str__(self):
+        """Summarize the conversion."""
+        elapsed = time.perf_counter() - self.start
+        return (f'{self.files} files, {self.programmes} programmes, {len(self.failures)} failed '
+                f'in {elapsed:.2f} s ({self.programmes / max(elapsed, 1e-9):.0f} programmes/s)')
+
+
+def _dumps(results, report):
+    """Yield the dumps of results, counting them in report."""
+    for result in results:
+        report.add(result)
+        yield from result.dumps
+
+
+def write_files(results, source, destination, report):
+    """Write every dump as a .mpkminiplus file, mirroring the source tree."""
+    for result in results:
+        report.add(result)
+        stem = os.path.splitext(os.path.relpath(result.path, source))[0]
+        for position, dump in enumerate(result.dumps):
+            suffix = f'-{position + 1}' if len(result.dumps) > 1 else ''
+            path = os.path.join(destination, stem + suffix + PROGRAMME_EXTENSION)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(dump)
+
+
+def main(argv=None):
+    """Convert a directory tree into .mpkminiplus files or one library."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('source', help='directory of .mpkminiplus and .syx files')
+    parser.add_argument('destination', help='output directory, or a .mpklib library file')
+    parser.add_argument('--pad-channel', type=int, help='force the pad channel, 1 to 16')
+    parser.add_argument('--key-channel', type=int, help='force the keyboard channel, 1 to 16')
+    parser.add_argument('--title', help='rename titles, e.g. "{stem}" or "ARCH{position}"')
+    parser.add_argument('--workers', type=int, help='worker processes, one per cpu by default')
+    args = parser.parse_args(argv)
+    if args.title is not None:
+        try:
+            args.title.format(stem='', position=1)
+        except (KeyError, IndexError, ValueError) as e:
+            parser.error(f'invalid --title {args.title!r}: {e!r}')
+
+    normalize = Normalize(args.pad_channel, args.key_channel, args.title)
+    results = convert(find_files(args.source), normalize, args.workers)
+    report = Report()
+    if args.destination.endswith(LIBRARY_EXTENSION):
+        write_library(args.destination, _dumps(results, report))
+    else:
+        write_files(results, args.source, args.destination, report)
+    print(report)
+    return 1 if report.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
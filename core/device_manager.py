@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Manage several MPK mini plus controllers at once."""
+from concurrent.futures import ThreadPoolExecutor
+
+import rtmidi
+
+from core.midi_interface import AkaiMPKPlus
+from core.ports import PortManager
+
+
+class DeviceManager():
+    """Open an interface for every connected controller and fan writes out to them."""
+
+    def __init__(self, timeout=AkaiMPKPlus.TIMEOUT, verify_writes=False, backend=rtmidi):
+        """Init the interface settings and open every controller."""
+        self.timeout = timeout
+        self.verify_writes = verify_writes
+        self.backend = backend
+        self.ports = PortManager(backend.MidiOut(), backend.MidiIn())    # only lists ports
+        self.devices = {}
+        self.scan()
+
+    def scan(self):
+        """Open an interface for each controller with both an out and an in port.
+
+        Returns a dict of interfaces keyed by device index, identical units can
+        share a port name. Each interface has its port names in ports. Interfaces
+        of the last scan are reused, those no longer needed are closed.
+        """
+        devices = {}
+        for device in range(self.ports.count()):
+            midi = self.devices.pop(device, None)
+            if midi is None:
+                midi = AkaiMPKPlus(self.timeout, self.verify_writes, self.backend, device)
+            else:
+                midi.poll_ports()
+            if midi.connected and midi.ports.out_port:
+                devices[device] = midi
+            else:
+                midi.close()
+        self.close()
+        self.devices = devices
+        return devices
+
+    def close(self):
+        """Close every interface."""
+        for midi in self.devices.values():
+            midi.close()
+        self.devices = {}
+
+    def _run(self, function):
+        """Call function with each interface in parallel.
+
+        Returns a dict of results keyed by device index, or the exception raised.
+        """
+        results = {}
+        if not self.devices:
+            return results
+        with ThreadPoolExecutor(max_workers=len(self.devices)) as pool:
+            futures = {
+                device: pool.submit(function, midi)
+                for device, midi in self.devices.items()
+            }
+            for device, future in futures.items():
+                try:
+                    results[device] = future.result()
+                except Exception as error:    # pylint: disable=broad-except
+                    results[device] = error
+        return results
+
+    def send_programmes(self, configs, verify=None):
+        """Write configs to every controller in parallel.
+
+        Returns the unverified programme numbers, or the exception, per device.
+        """
+        return self._run(lambda midi: midi.send_programmes(configs, verify))
+
+    def get_programmes(self, programmes=range(1, 9)):
+        """Read programmes from every controller in parallel.
+
+        Returns the list of configs, or the exception, per device.
+        """
+        return self._run(lambda midi: midi.get_programmes(programmes))
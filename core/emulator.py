@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Software emulator of the MPK mini plus for benchmarks and tests."""
+import random
+import threading
+import time
+
+from core.config import CONFIG_LENGTH, Config
+
+
+class EmulatedPort():
+    """Midi port of the emulator with the parts of the rtmidi API the interface uses."""
+
+    def __init__(self, device):
+        """Init a closed port on device."""
+        self.device = device
+        self.callback = None
+        self._is_open = False
+
+    def get_ports(self):
+        """Return the port names, empty while the device is unplugged."""
+        return [self.device.PORT_NAME] if self.device.connected else []
+
+    def open_port(self, port=0, name=None):    # pylint: disable=unused-argument
+        """Open the port."""
+        self._is_open = True
+
+    def close_port(self):
+        """Close the port, it stops receiving replies."""
+        self._is_open = False
+        self.cancel_callback()
+
+    def is_port_open(self):
+        """Return True if the port is open."""
+        return self._is_open
+
+    def ignore_types(self, sysex=True, timing=True, active_sense=True):
+        """Accept every message type, nothing else is ever sent."""
+
+    def set_callback(self, func, data=None):
+        """Call func with ((message, delta), data) for each incoming message."""
+        self.callback = (func, data)
+        if self not in self.device.inputs:
+            self.device.inputs.append(self)
+
+    def cancel_callback(self):
+        """Stop calling the callback."""
+        self.callback = None
+        if self in self.device.inputs:
+            self.device.inputs.remove(self)
+
+    def get_message(self):
+        """Return None, replies only go through the callback."""
+        return None
+
+    def send_message(self, message):
+        """Send message to the device."""
+        if self._is_open and self.device.connected:
+            self.device.receive(message)
+
+
+class MPKMiniPlusEmulator():
+    """Pure python stand-in for an MPK mini plus speaking its SysEx protocol.
+
+    Pass it as the backend of AkaiMPKPlus. It answers GET_CONFIG with the
+    stored 2902 byte dump under the reply command byte after latency plus up
+    to jitter seconds, stores written programmes and keeps RAM in slot 0.
+    """
+
+    PORT_NAME = 'MPK mini Plus Emulator'
+    GET_HEADER = [240, 71, 127, 84, 102]
+    WRITE_HEADER = [240, 71, 127, 84, 100]
+    REPLY_HEADER = [240, 71, 127, 84, 103]
+
+    def __init__(self, latency=0.0, jitter=0.0, seed=None):
+        """Init the programmes with the default config."""
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.connected = True
+        self.inputs = []
+        self.requests = 0
+        self.writes = 0
+        self.programmes = {}
+        for p_i in range(0, 9):
+            config = Config()
+            config.programme = p_i
+            self.programmes[p_i] = config.serialize()
+
+    def MidiOut(self):    # pylint: disable=invalid-name
+        """Return an output port to the device, like rtmidi.MidiOut."""
+        return EmulatedPort(self)
+
+    def MidiIn(self):    # pylint: disable=invalid-name
+        """Return an input port from the device, like rtmidi.MidiIn."""
+        return EmulatedPort(self)
+
+    def receive(self, message):
+        """Handle a message sent to the device."""
+        message = list(message)
+        if message[5:10] == self.GET_HEADER and message[12] in self.programmes:
+            self.requests += 1
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            threading.Timer(delay, self._reply, (message[12], )).start()
+        elif message[0:5] == self.WRITE_HEADER and len(message) == CONFIG_LENGTH:
+            self.writes += 1
+            self.programmes[message[7]] = message
+
+    def _reply(self, p_i):
+        """Send the dump of programme p_i to every open input, as the device does."""
+        reply = self.REPLY_HEADER + self.programmes[p_i][len(self.REPLY_HEADER):]
+        for port in self.inputs:
+            if port.is_port_open() and port.callback:
+                func, data = port.callback
+                func((reply, 0.0), data)
+
+
+def benchmark(rounds=10, latency=0.005, jitter=0.002):
+    """Time fetching and sending all programmes through the emulator.
+
+    Returns a dict of average seconds per round.
+    """
+    from core.midi_interface import AkaiMPKPlus    # pylint: disable=import-outside-toplevel
+
+    midi = AkaiMPKPlus(backend=MPKMiniPlusEmulator(latency, jitter, seed=0))
+    configs = midi.get_programmes()
+    timings = {}
+    for name, function in (('get_programme', lambda: midi.get_programme(1)),
+                           ('get_programmes', midi.get_programmes),
+                           ('send_programmes', lambda: midi.send_programmes(configs))):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            function()
+        timings[name] = (time.perf_counter() - start) / rounds
+    return timings
+
+
+if __name__ == '__main__':
+    for key, value in benchmark().items():
+        print(f'{key}: {value * 1000:.1f} ms')
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Preset library files packing many programme dumps into fixed size slots, read through mmap."""
+import mmap
+import struct
+
+from core.config import CONFIG_LENGTH, FINGERPRINT_SIZE, LazyConfig, hash_dump
+
+MAGIC = b'MPKL'
+VERSION = 1
+HEADER = struct.Struct('<4sBxxxII')    # magic, version, programme count, index offset
+TITLE = slice(8, 24)
+INDEX_ENTRY = struct.Struct(f'<{TITLE.stop - TITLE.start}s{FINGERPRINT_SIZE}s')    # title, hash
+EXTENSION = '.mpklib'
+
+
+def write_library(path, dumps):
+    """Write an iterable of dumps to a library file, one slot each.
+
+    Dumps are streamed to disk, the index of titles and hashes follows the
+    slots and is located through the header. Returns the number of programmes.
+    """
+    index = []
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        for dump in dumps:
+            dump = bytes(dump)
+            if len(dump) != CONFIG_LENGTH:
+                raise ValueError(f'expected {CONFIG_LENGTH} bytes, got {len(dump)}')
+            f.write(dump)
+            index.append(INDEX_ENTRY.pack(dump[TITLE], bytes.fromhex(hash_dump(dump))))
+        index_offset = f.tell()
+        f.write(b''.join(index))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(index), index_offset))
+    return len(index)
+
+
+class Library():
+    """Read only view of a library file, programmes are fetched by index without reading it all."""
+
+    def __init__(self, path):
+        """Map path and read its header."""
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size:
+            self.map.close()
+            raise ValueError('not an MPK mini Plus library')
+        magic, version, self.count, self.index_offset = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError('not an MPK mini Plus library')
+        if (self.index_offset < HEADER.size + self.count * CONFIG_LENGTH
+                or len(self.map) < self.index_offset + self.count * INDEX_ENTRY.size):
+            self.map.close()
+            raise ValueError('truncated MPK mini Plus library')
+        self._fingerprints = None
+
+    def __enter__(self):
+        """Use the library as a context manager."""
+        return self
+
+    def __exit__(self, *exc):
+        """Unmap the file."""
+        self.close()
+
+    def close(self):
+        """Unmap the file."""
+        self.map.close()
+
+    def __len__(self):
+        """Return the number of programmes."""
+        return self.count
+
+    def _slot(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return HEADER.size + i * CONFIG_LENGTH
+
+    def _entry(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return INDEX_ENTRY.unpack_from(self.map, self.index_offset + i * INDEX_ENTRY.size)
+
+    def dump(self, i):
+        """Return the dump of programme i as bytes."""
+        start = self._slot(i)
+        return self.map[start:start + CONFIG_LENGTH]
+
+    def records(self, start=0, stop=None):
+        """Return the dumps of programmes start to stop concatenated, for ProgrammeBatch."""
+        stop = self.count if stop is None else min(stop, self.count)
+        return self.map[HEADER.size + start * CONFIG_LENGTH:HEADER.size + stop * CONFIG_LENGTH]
+
+    def __getitem__(self, i):
+        """Return programme i as a LazyConfig."""
+        return LazyConfig(self.dump(i))
+
+    def __iter__(self):
+        """Iterate over the programmes as LazyConfigs."""
+        return (self[i] for i in range(self.count))
+
+    def title(self, i):
+        """Return the title of programme i, read from the index."""
+        return self._entry(i)[0].rstrip(b'\0').decode('ascii', 'replace')
+
+    def fingerprint(self, i):
+        """Return the content hash of programme i, read from the index."""
+        return self._entry(i)[1].hex()
+
+    def find(self, fingerprint):
+        """Return the index of the first programme with fingerprint, or None."""
+        if self._fingerprints is None:
+            self._fingerprints = {}
+            for i in range(self.count - 1, -1, -1):
+                self._fingerprints[self.fingerprint(i)] = i
+        return self._fingerprints.get(fingerprint)
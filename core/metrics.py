@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Latency and throughput counters for the midi transport."""
+import json
+import threading
+from collections import deque
+
+OPERATIONS = ('fetch', 'programme_write', 'ram_write')
+LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+BUCKET_LABELS = [f'<={limit}' for limit in LATENCY_BUCKETS] + [f'>{LATENCY_BUCKETS[-1]}']
+MAX_SAMPLES = 4096
+
+
+class TransportMetrics():
+    """Per operation request, byte, latency, timeout and retry counters."""
+
+    def __init__(self):
+        """Start with empty counters."""
+        self._lock = threading.Lock()
+        self.operations = {}
+        self.reset()
+
+    def reset(self):
+        """Clear every counter."""
+        with self._lock:
+            self.operations = {
+                operation: {
+                    'requests': 0,
+                    'bytes_out': 0,
+                    'bytes_in': 0,
+                    'timeouts': 0,
+                    'retries': 0,
+                    'histogram': [0] * (len(LATENCY_BUCKETS) + 1),
+                    'latencies': deque(maxlen=MAX_SAMPLES)
+                }
+                for operation in OPERATIONS
+            }
+
+    def record(self, operation, bytes_out, bytes_in=0, latency=None):
+        """Count a request of operation and its round trip latency in seconds."""
+        with self._lock:
+            counters = self.operations[operation]
+            counters['requests'] += 1
+            counters['bytes_out'] += bytes_out
+            counters['bytes_in'] += bytes_in
+            if latency is not None:
+                counters['latencies'].append(latency)
+                bucket = sum(1 for limit in LATENCY_BUCKETS if latency > limit)
+                counters['histogram'][bucket] += 1
+
+    def timeout(self, operation, count=1):
+        """Count requests of operation that got no reply."""
+        with self._lock:
+            self.operations[operation]['timeouts'] += count
+
+    def retry(self, operation, count=1):
+        """Count requests of operation that had to be sent again."""
+        with self._lock:
+            self.operations[operation]['retries'] += count
+
+    @staticmethod
+    def percentile(samples, percent):
+        """Return the nearest rank percentile of sorted samples."""
+        if not samples:
+            return None
+        rank = max(0, min(len(samples) - 1, round(percent / 100 * len(samples)) - 1))
+        return samples[rank]
+
+    def snapshot(self):
+        """Return the counters as a dict of plain values, latencies in seconds."""
+        with self._lock:
+            output = {}
+            for operation, counters in self.operations.items():
+                latencies = sorted(counters['latencies'])
+                output[operation] = {
+                    'requests': counters['requests'],
+                    'bytes_out': counters['bytes_out'],
+                    'bytes_in': counters['bytes_in'],
+                    'timeouts': counters['timeouts'],
+                    'retries': counters['retries'],
+                    'latency': {
+                        'p50': self.percentile(latencies, 50),
+                        'p90': self.percentile(latencies, 90),
+                        'p99': self.percentile(latencies, 99),
+                        'max': latencies[-1] if latencies else None
+                    },
+                    'histogram': dict(zip(BUCKET_LABELS, counters['histogram']))
+                }
+            return output
+
+    def dump(self, filepath):
+        """Write the snapshot to filepath as JSON."""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
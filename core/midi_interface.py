@@ -21,75 +21,274 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Interface with Akai MPK Plus."""
+import queue
 import time
 
 import rtmidi
 
-from core.config import Config
+from core.config import CONFIG_LENGTH, Config
+from core.metrics import TransportMetrics
+from core.ports import PortManager
+from core.syx import to_frame
+from core.validation import check
 
 
 class AkaiMPKPlus():
     """Midi interface for Akai MPK mini plus."""
 
     GET_CONFIG = [240, 126, 6, 1, 127, 240, 71, 127, 84, 102, 0, 1, 1, 247]
+    TIMEOUT = 1.0
+    WRITE_INTERVAL = 0.1
+    VERIFY_RETRIES = 3
+    VERIFY_BACKOFF = 0.05
+    MAX_BACKOFF = 0.5
 
-    def __init__(self):
-        """Init config and midi connection."""
+    config_class = Config    # or ConfigBuffer to parse replies without decoding them
+
+    def __init__(self, timeout=TIMEOUT, verify_writes=False, backend=rtmidi, device=0):
+        """Init config and midi connection.
+
+        backend provides the MidiOut and MidiIn classes, rtmidi or an emulator.
+        device picks which of several connected controllers to use.
+        """
         self.midi_config = Config()
+        self.timeout = timeout
+        self.verify_writes = verify_writes
+        self.replies = queue.Queue()
+        self.metrics = TransportMetrics()
+        self._last_write = 0.0
+        self.mo = backend.MidiOut()
+        self.mi = backend.MidiIn()
+        self.ports = PortManager(self.mo, self.mi, device=device)
+        self._open_ports = (None, None)
         self.connected = self.midi_setup()
 
-    # pylint: disable=no-member
     def midi_setup(self):
-        """Create the midi connection."""
-        self.mo = rtmidi.MidiOut()
-        self.mi = rtmidi.MidiIn()
-
-        is_out_open, is_in_open = False, False
-        for i, p in enumerate(self.mo.get_ports()):
-            if any(mpk in p for mpk in ('MPKmini', 'MPK mini')):
-                if not self.mo.is_port_open():
-                    self.mo.open_port(i)
-                is_out_open = True
-        for i, p in enumerate(self.mi.get_ports()):
-            if any(mpk in p for mpk in ('MPKmini', 'MPK mini')):
-                if not self.mi.is_port_open():
-                    self.mi.open_port(i)
-                    self.mi.ignore_types(sysex=False)
-                is_in_open = True
-
-        if not is_out_open and not is_in_open:
+        """Open the controller ports, reusing the midi objects.
+
+        Returns True if the controller was found.
+        """
+        out_port, in_port = self.ports.resolve()
+        if out_port != self._open_ports[0]:
+            if self.mo.is_port_open():
+                self.mo.close_port()
+            if out_port:
+                self.mo.open_port(out_port[0])
+        if in_port != self._open_ports[1]:
+            if self.mi.is_port_open():
+                self.mi.close_port()
+            if in_port:
+                self.mi.open_port(in_port[0])
+                self.mi.ignore_types(sysex=False)
+                self.mi.set_callback(self._on_midi_in)
+        self._open_ports = (out_port, in_port)
+        return bool(out_port or in_port)
+
+    def poll_ports(self):
+        """Reconnect in place if the port lists changed since the last poll.
+
+        Returns True if they changed.
+        """
+        if not self.ports.poll():
             return False
+        self.connected = self.midi_setup()
         return True
 
-    def send_midi_message(self, out_message):
-        """Send out_message to the midi controler."""
-        # print('out:', out_message)
+    def close(self):
+        """Cancel the input callback and close both ports."""
+        if self.mi.is_port_open():
+            self.mi.cancel_callback()
+            self.mi.close_port()
+        if self.mo.is_port_open():
+            self.mo.close_port()
+        self._open_ports = (None, None)
+        self.connected = False
 
-        in_message = [[]]
-        self.mo.send_message(out_message)
-        time.sleep(0.1)
-        in_message = self.mi.get_message()
-        while in_message and len(in_message[0]) < 2902:
-            in_message = self.mi.get_message()
-
-        # print('in:', in_message)
-        if in_message is not None:
-            in_message = in_message[0]    # strip midi time
-        return in_message
+    def _on_midi_in(self, event, data=None):    # pylint: disable=unused-argument
+        """Queue complete programme dumps, called from the rtmidi thread."""
+        message = event[0]    # strip midi time
+        if message and message[0] == 240 and len(message) >= CONFIG_LENGTH:
+            self.replies.put(message)
 
-    def get_programme(self, p_i):
-        """Get programme p_i from the midi controller.
+    def is_request(self, out_message):
+        """Return True if out_message asks the controller for a programme."""
+        return out_message[5:10] == self.GET_CONFIG[5:10]
 
-        Returns a config dataclass of parsed response.
+    def wait_for_programme(self, p_i, timeout=None):
+        """Wait for the dump of programme p_i.
+
+        Returns the message or None if nothing arrived before the timeout.
         """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                in_message = self.replies.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if in_message[7] == p_i:
+                return in_message
+
+    def operation(self, out_message):
+        """Return the metrics operation name of out_message."""
+        if self.is_request(out_message):
+            return 'fetch'
+        return 'ram_write' if out_message[7] == 0 else 'programme_write'
+
+    def send_midi_message(self, out_message, timeout=None):
+        """Send out_message to the midi controler.
+
+        Requests wait for the matching reply and return it, or None on timeout.
+        Writes return None as soon as they are sent.
+        """
+        if not self.is_request(out_message):
+            wait = self._last_write + self.WRITE_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self.mo.send_message(out_message)
+            self._last_write = time.monotonic()
+            self.metrics.record(self.operation(out_message), len(out_message))
+            return None
+
+        while not self.replies.empty():    # drop replies nobody waited for
+            self.replies.get_nowait()
+        start = time.monotonic()
+        self.mo.send_message(out_message)
+        in_message = self.wait_for_programme(out_message[12], timeout)
+        if in_message is None:
+            self.metrics.timeout('fetch')
+            self.metrics.record('fetch', len(out_message))
+        else:
+            self.metrics.record('fetch', len(out_message), len(in_message),
+                                time.monotonic() - start)
+        return in_message
+
+    def request_message(self, p_i):
+        """Build the GET_CONFIG request for programme p_i."""
         out_message = self.GET_CONFIG[:]
         out_message[12] = p_i
-        # print('out', out_message)
-        in_message = self.send_midi_message(out_message)
-        # print('in', in_message)
-        config = Config()
+        return out_message
+
+    def request_programmes(self, programmes, window=8, timeout=None):
+        """Request several programmes, keeping up to window requests in flight.
+
+        Returns a dict of replies keyed by the programme byte, programmes
+        that did not answer before the timeout are missing.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        pending = list(programmes)
+        in_flight = {}
+        replies = {}
+        while not self.replies.empty():    # drop replies nobody waited for
+            self.replies.get_nowait()
+
+        deadline = time.monotonic() + timeout
+        while pending or in_flight:
+            while pending and len(in_flight) < window:
+                p_i = pending.pop(0)
+                self.mo.send_message(self.request_message(p_i))
+                in_flight[p_i] = time.monotonic()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                in_message = self.replies.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if in_message[7] in in_flight:
+                start = in_flight.pop(in_message[7])
+                replies[in_message[7]] = in_message
+                self.metrics.record('fetch', len(self.GET_CONFIG), len(in_message),
+                                    time.monotonic() - start)
+                deadline = time.monotonic() + timeout
+        for _ in in_flight:
+            self.metrics.record('fetch', len(self.GET_CONFIG))
+        self.metrics.timeout('fetch', len(pending) + len(in_flight))
+        return replies
+
+    def parse_programme(self, in_message):
+        """Parse in_message into a config, reconnecting if it is missing."""
+        config = self.config_class()
         try:
             config.parse_config(in_message)
         except TypeError:
             self.midi_setup()
         return config
+
+    def get_programme(self, p_i):
+        """Get programme p_i from the midi controller.
+
+        Returns a config dataclass of parsed response.
+        """
+        out_message = self.request_message(p_i)
+        in_message = self.send_midi_message(out_message)
+        return self.parse_programme(in_message)
+
+    def get_programmes(self, programmes=range(1, 9), window=8):
+        """Get several programmes from the midi controller in one pipelined batch.
+
+        Returns a list of config dataclasses ordered like programmes.
+        """
+        replies = self.request_programmes(programmes, window)
+        return [self.parse_programme(replies.get(p_i)) for p_i in programmes]
+
+    def backoff(self, attempt):
+        """Return the delay before retry number attempt."""
+        return min(self.VERIFY_BACKOFF * 2**attempt, self.MAX_BACKOFF)
+
+    @staticmethod
+    def unverified(pending, replies):
+        """Return the pending messages whose reply does not match what was sent.
+
+        The header before the programme byte is skipped, the controller
+        answers with a different command byte.
+        """
+        return {
+            p_i: message
+            for p_i, message in pending.items()
+            if replies.get(p_i) is None or list(replies[p_i][7:]) != list(message[7:])
+        }
+
+    def send_programmes(self, configs, verify=None):
+        """Write each config to the programme slot it names.
+
+        Raises InvalidConfig before sending anything if a config is out of range.
+        The write header is always used, a config read back carries the reply one.
+        With verify, every slot is read back and only the ones that differ
+        are written again, up to VERIFY_RETRIES times with a growing delay.
+        Returns the sorted programme numbers that could not be verified.
+        """
+        configs = list(configs)
+        check(configs)
+        verify = self.verify_writes if verify is None else verify
+        pending = {config.programme: to_frame(config, config.programme) for config in configs}
+        for attempt in range(self.VERIFY_RETRIES + 1):
+            for message in pending.values():
+                if attempt:
+                    self.metrics.retry(self.operation(message))
+                self.send_midi_message(message)
+            if not verify:
+                return []
+            pending = self.unverified(pending, self.request_programmes(pending.keys()))
+            if not pending or attempt == self.VERIFY_RETRIES:
+                break
+            time.sleep(self.backoff(attempt))
+        return sorted(pending)
+
+    def send_programme(self, config, verify=None):
+        """Write config to the programme slot it names.
+
+        Returns True unless verify is on and the write could not be verified.
+        """
+        return not self.send_programmes([config], verify)
+
+    def send_ram(self, config, verify=None):
+        """Write config to RAM without overriding a programme.
+
+        Returns True unless verify is on and the write could not be verified.
+        """
+        config.programme = 0
+        return not self.send_programmes([config], verify)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Field level diffs between MPK mini Plus configs, and patches applying them."""
+import struct
+from dataclasses import dataclass
+from itertools import groupby
+
+from core.config import CONFIG_LENGTH, LAYOUT, RECORD_WIDTHS
+from core.validation import RECORD_RANGES
+
+MAGIC = b'MPKP'
+VERSION = 1
+HEADER = struct.Struct('<4sBH')    # magic, version, run count
+RUN = struct.Struct('<HB')    # offset, length
+MAX_RUN = 255
+TEXT_FIELDS = ('title', 'name')
+
+
+def _compile_fields():
+    """Split every LAYOUT entry but the programme byte into the fields a change covers.
+
+    Returns (start, stop, fields) per entry, fields being (label, start, stop, format)
+    where format is 'text', 'list' or the shift added to a single byte.
+    """
+    entries = []
+    for name, _, offset, width, kind in LAYOUT:
+        if name == 'programme':
+            continue
+        if kind in ('byte', 'channel'):
+            fields = [(name, offset, offset + 1, 1 if kind == 'channel' else 0)]
+        elif kind == 'list':
+            fields = [(name, offset, offset + width, 'text' if name in TEXT_FIELDS else 'list')]
+        elif kind == 'sparse':
+            fields = [(f'{name}[{i}]', offset + i, offset + i + 1, 0) for i in range(width)]
+        else:
+            fields, record_width = [], RECORD_WIDTHS[kind]
+            for key in range(1, width // record_width + 1):
+                start = offset + (key - 1) * record_width
+                for column, group in groupby(column for column, *_ in RECORD_RANGES[kind]):
+                    size = len(list(group))
+                    fmt = 'text' if column in TEXT_FIELDS else 'list' if size > 1 else 0
+                    fields.append((f'{name}[{key}].{column}', start, start + size, fmt))
+                    start += size
+        entries.append((offset, offset + width, tuple(fields)))
+    return tuple(entries)
+
+
+ENTRIES = _compile_fields()
+FIELDS = {start: (label, stop, fmt) for *_, fields in ENTRIES for label, start, stop, fmt in fields}
+FIELD_STARTS = [None] * CONFIG_LENGTH    # start of the field holding each offset
+for _start, (_, _stop, _) in FIELDS.items():
+    FIELD_STARTS[_start:_stop] = [_start] * (_stop - _start)
+
+
+def _show(value, fmt):
+    """Format the bytes of a field in config units."""
+    if fmt == 'text':
+        return repr(bytes(value).rstrip(b'\0').decode('ascii', 'replace'))
+    if fmt == 'list':
+        return str(list(value))
+    return str(value[0] + fmt)
+
+
+@dataclass(frozen=True)
+class Change():
+    """The new bytes of one field, old is None when the patch was loaded from bytes."""
+
+    offset: int
+    old: bytes
+    new: bytes
+
+    @property
+    def label(self):
+        """Return the field, as in pads[5].note or knobs[3].name."""
+        return FIELDS[self.offset][0]
+
+    def __str__(self):
+        """Describe the change in config units."""
+        fmt = FIELDS[self.offset][2]
+        old = '' if self.old is None else _show(self.old, fmt)
+        return f'{self.label} {old}→{_show(self.new, fmt)}'
+
+
+@dataclass(frozen=True)
+class Patch():
+    """The changes turning one config into another, the programme byte is never part of it."""
+
+    changes: tuple = ()
+
+    def __len__(self):
+        """Return the number of changed fields."""
+        return len(self.changes)
+
+    def __iter__(self):
+        """Iterate over the changes."""
+        return iter(self.changes)
+
+    def __str__(self):
+        """Describe one change per line."""
+        return '\n'.join(str(change) for change in self.changes)
+
+    def fields(self):
+        """Return the labels of the changed fields, in dump order."""
+        return [change.label for change in self.changes]
+
+    def apply(self, config, strict=False):
+        """Return a copy of config, of the same class, with the patch applied.
+
+        With strict, raises ValueError if config does not hold the old values.
+        """
+        data = bytearray(config.serialize())
+        if strict:
+            conflicts = [
+                change.label for change in self.changes if change.old is not None
+                and data[change.offset:change.offset + len(change.old)] != change.old
+            ]
+            if conflicts:
+                raise ValueError('patch does not apply to ' + ', '.join(conflicts))
+        for change in self.changes:
+            data[change.offset:change.offset + len(change.new)] = change.new
+        patched = type(config)()
+        patched.parse_config(bytes(data))
+        return patched
+
+    def runs(self):
+        """Group the changes into (offset, new bytes) runs of consecutive offsets."""
+        runs = []
+        for change in self.changes:
+            if runs and runs[-1][0] + len(runs[-1][1]) == change.offset and len(
+                    runs[-1][1]) + len(change.new) <= MAX_RUN:
+                runs[-1][1].extend(change.new)
+            else:
+                runs.append((change.offset, bytearray(change.new)))
+        return runs
+
+    def to_bytes(self):
+        """Encode the new values of the patch, the old ones are dropped."""
+        runs = self.runs()
+        chunks = [HEADER.pack(MAGIC, VERSION, len(runs))]
+        for offset, data in runs:
+            chunks += [RUN.pack(offset, len(data)), data]
+        return b''.join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a patch written by to_bytes, splitting its runs back into fields."""
+        if len(data) < HEADER.size:
+            raise ValueError('not an MPK mini Plus patch')
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not an MPK mini Plus patch')
+        position = HEADER.size
+        changes = []
+        for _ in range(count):
+            offset, length = RUN.unpack_from(data, position)
+            position += RUN.size
+            stop = offset + length
+            while offset < stop:
+                if offset >= CONFIG_LENGTH or FIELD_STARTS[offset] != offset:
+                    raise ValueError(f'patch run does not start a field at {offset}')
+                label, field_stop, _ = FIELDS[offset]
+                if field_stop > stop:
+                    raise ValueError(f'patch run ends inside {label}')
+                size = field_stop - offset
+                changes.append(Change(offset, None, bytes(data[position:position + size])))
+                position += size
+                offset = field_stop
+        return cls(tuple(changes))
+
+
+def diff(old, new):
+    """Return the Patch turning config old into config new, one change per changed field.
+
+    Works with Config, LazyConfig and ConfigBuffer, unchanged LAYOUT entries are
+    skipped with one comparison each.
+    """
+    old_data = bytes(old.serialize())
+    new_data = bytes(new.serialize())
+    changes = []
+    for start, stop, fields in ENTRIES:
+        if old_data[start:stop] == new_data[start:stop]:
+            continue
+        changes += [
+            Change(start, old_data[start:stop], new_data[start:stop])
+            for _, start, stop, _ in fields if old_data[start:stop] != new_data[start:stop]
+        ]
+    return Patch(tuple(changes))
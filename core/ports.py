@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Port resolution and hotplug detection for the MPK mini plus."""
+
+MPK_PORT_NAMES = ('MPKmini', 'MPK mini')
+
+
+class PortManager():
+    """Resolve the controller ports once and watch the port lists for changes."""
+
+    def __init__(self, midi_out, midi_in, names=MPK_PORT_NAMES, device=0):
+        """Init the caches for midi_out and midi_in.
+
+        device picks which of several connected controllers to use.
+        """
+        self.mo = midi_out
+        self.mi = midi_in
+        self.names = names
+        self.device = device
+        self.out_port = None    # (index, name)
+        self.in_port = None
+        self._out_ports = []
+        self._in_ports = []
+
+    def _find(self, ports, cached):
+        """Return the cached port if it is still in place, else search ports."""
+        if cached and cached[0] < len(ports) and ports[cached[0]] == cached[1]:
+            return cached
+        matches = self.matching(ports)
+        return matches[self.device] if self.device < len(matches) else None
+
+    def matching(self, ports):
+        """Return the (index, name) of every controller port in ports."""
+        return [(i, p) for i, p in enumerate(ports) if any(mpk in p for mpk in self.names)]
+
+    def count(self):
+        """Return the number of controllers with both an out and an in port."""
+        return min(len(self.matching(self.mo.get_ports())),
+                   len(self.matching(self.mi.get_ports())))
+
+    def resolve(self):
+        """Return the (index, name) of the controller out and in ports.
+
+        A port is None if the controller is not connected.
+        """
+        self._out_ports = self.mo.get_ports()
+        self._in_ports = self.mi.get_ports()
+        self.out_port = self._find(self._out_ports, self.out_port)
+        self.in_port = self._find(self._in_ports, self.in_port)
+        return self.out_port, self.in_port
+
+    def poll(self):
+        """Return True if the port lists changed since the last resolve or poll."""
+        out_ports, in_ports = self.mo.get_ports(), self.mi.get_ports()
+        changed = out_ports != self._out_ports or in_ports != self._in_ports
+        self._out_ports, self._in_ports = out_ports, in_ports
+        return changed
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Shadow copy of the programmes stored on the MPK mini plus."""
+
+
+class DeviceShadow():
+    """Last state read from or written to each programme slot of the controller."""
+
+    def __init__(self):
+        """Start with every slot unknown, slots map to content fingerprints."""
+        self.programmes = {}
+
+    def update(self, config):
+        """Record config as the state of the slot it names."""
+        self.programmes[config.programme] = config.fingerprint()
+
+    def is_dirty(self, config):
+        """Return True if config differs from the state of the slot it names."""
+        return self.programmes.get(config.programme) != config.fingerprint()
+
+    def invalidate(self, programme=None):
+        """Forget programme, or every slot if programme is None."""
+        if programme is None:
+            self.programmes.clear()
+        else:
+            self.programmes.pop(programme, None)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Streaming import and export of standard .syx files of MPK mini Plus programmes."""
+from core.config import CONFIG_LENGTH, DEFAULT_START_SYSEX, Config
+
+EXTENSION = '.syx'
+SYSEX_START = 0xF0
+SYSEX_END = 0xF7
+CHUNK_SIZE = 1 << 16
+MPK_ID = bytes(DEFAULT_START_SYSEX[1:4])    # Akai, any device, MPK mini Plus
+
+
+def iter_frames(stream, chunk_size=CHUNK_SIZE):
+    """Yield every F0 … F7 message of a binary stream as bytes, reading it in chunks.
+
+    Bytes between messages are skipped, a message cut short by a new F0 is dropped.
+    """
+    frame = None
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        position = 0
+        while position < len(chunk):
+            if frame is None:
+                start = chunk.find(SYSEX_START, position)
+                if start == -1:
+                    break
+                frame, position = bytearray(), start
+            stop = chunk.find(SYSEX_END, position)
+            # a frame just started at position holds nothing yet, its own F0 is not a restart
+            restart = chunk.find(SYSEX_START, position + (not frame), stop if stop != -1 else None)
+            if restart != -1:
+                frame, position = None, restart
+                continue
+            if stop == -1:
+                frame += chunk[position:]
+                break
+            frame += chunk[position:stop + 1]
+            yield bytes(frame)
+            frame, position = None, stop + 1
+
+
+def is_programme(frame):
+    """Return True if frame is a programme dump of the MPK mini Plus."""
+    return len(frame) == CONFIG_LENGTH and frame[1:4] == MPK_ID
+
+
+def iter_programmes(stream):
+    """Yield (slot, dump) for every programme of a .syx stream, slot 0 is RAM."""
+    for frame in iter_frames(stream):
+        if is_programme(frame):
+            yield frame[7], frame
+
+
+def read_syx(path, config_class=Config):
+    """Read the programmes of a .syx file into a dict of configs keyed by slot.
+
+    A slot dumped several times keeps its last dump.
+    """
+    configs = {}
+    with open(path, 'rb') as f:
+        for slot, dump in iter_programmes(f):
+            config = config_class()
+            config.parse_config(dump)
+            configs[slot] = config
+    return configs
+
+
+def to_frame(config, slot):
+    """Return config as a write message for slot."""
+    frame = bytearray(config.serialize())
+    frame[:len(DEFAULT_START_SYSEX)] = bytes(DEFAULT_START_SYSEX)
+    frame[7] = slot
+    return frame
+
+
+def write_syx(path, configs):
+    """Write a dict of configs keyed by slot as one write message each."""
+    with open(path, 'wb') as f:
+        for slot in sorted(configs):
+            f.write(to_frame(configs[slot], slot))
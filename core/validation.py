@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Range validation of MPK mini Plus configs before they are sent."""
+from dataclasses import dataclass
+
+from core.config import LAYOUT, RECORD_WIDTHS
+
+try:
+    import numpy as np
+except ImportError:    # numpy is only needed for batch processing
+    np = None
+
+DATA_BYTE = (0, 127)
+# name: (low, high) of the value as read from a Config, other fields are data bytes
+RANGES = {
+    'programme': (0, 8),
+    'pad_channel': (1, 16),
+    'pad_aftertouch': (0, 2),
+    'key_channel': (1, 16),
+    'key_octave': (0, 8),
+    'key_transpose': (0, 24),
+    'transport': (0, 1),
+    'arp_on': (0, 1),
+    'arp_mode': (0, 5),
+    'arp_time_div': (0, 7),
+    'arp_clock': (0, 2),
+    'arp_latch': (0, 1),
+    'arp_swing': (0, 25),
+    'arp_tempo_taps': (2, 4),
+    'arp_octave': (0, 3),
+    'arp_gate': (10, 99),
+    'note_repeat_time_div': (0, 7),
+    'note_repeat_on': (0, 1),
+    'cv_trigger_source': (0, 19),
+    'cv_note_priority': (0, 2),
+    'cv_gate_mode': (0, 1),
+    'cv_mod_source': (0, 1),
+    'cv_bend_range': (1, 12),
+    'cv_clock_in_div': (0, 11),
+    'cv_clock_out_div': (0, 11),
+    'scale_on': (0, 1),
+    'scale_key': (0, 11),
+    'scale_type': (0, 15),
+    'scale_non_s_note': (0, 1),
+    'chord_on': (0, 1),
+    'chord_type': (0, 5),
+    'chord_inversion': (0, 3),
+    'joystick_x_mode': (0, 2),
+    'joystick_y_mode': (0, 2),
+    'sysex_final': (247, 247),
+}
+# name: {index: (low, high)} for list elements that are not plain data bytes
+LIST_RANGES = {
+    'start_sysex': {0: (240, 240)},
+    'arp_tempo': {0: (0, 1)},
+}
+# kind: (column, low, high) for each byte of a record
+RECORD_RANGES = {
+    'pads': (('note', 0, 127), ('cc', 0, 127), ('pc', 0, 127), ('mode', 0, 2), ('toggle', 0, 1),
+             ('on_color', 0, 32), ('off_color', 0, 32)),
+    'knobs': (('cc', 0, 127), ('min', 0, 127), ('max', 0, 127), ('mode', 0, 1)) +
+    (('name', 0, 127), ) * 16,
+}
+
+
+@dataclass(frozen=True)
+class Violation():
+    """A config value outside of its range, row is its index in a batch."""
+
+    field: str
+    value: object
+    low: int
+    high: int
+    row: int = 0
+
+    def __str__(self):
+        """Describe the violation."""
+        return f'{self.field} is {self.value}, expected {self.low}..{self.high}'
+
+
+class InvalidConfig(ValueError):
+    """Raised instead of sending configs with violations."""
+
+    def __init__(self, violations):
+        """Keep the violations and summarize them as the message."""
+        self.violations = violations
+        summary = '; '.join(str(violation) for violation in violations[:3])
+        if len(violations) > 3:
+            summary += f' and {len(violations) - 3} more'
+        super().__init__(summary)
+
+
+def _check(violations, label, value, low, high, row):
+    if not isinstance(value, int) or not low <= value <= high:
+        violations.append(Violation(label, value, low, high, row))
+
+
+def validate(config, row=0):
+    """Return the violations of a Config, LazyConfig or ConfigBuffer."""
+    violations = []
+    for name, _, _, _, kind in LAYOUT:
+        value = getattr(config, name)
+        if kind in ('byte', 'channel'):
+            _check(violations, name, value, *RANGES.get(name, DATA_BYTE), row)
+        elif kind in RECORD_RANGES:
+            for key, record in value.items():
+                for (column, low, high), item in zip(RECORD_RANGES[kind], record):
+                    _check(violations, f'{name}[{key}].{column}', item, low, high, row)
+        elif kind == 'sparse':
+            items = value.items() if isinstance(value, dict) else enumerate(value)
+            for i, item in items:
+                _check(violations, f'{name}[{i}]', item, *DATA_BYTE, row)
+        else:
+            overrides = LIST_RANGES.get(name, {})
+            for i, item in enumerate(value):
+                _check(violations, f'{name}[{i}]', item, *overrides.get(i, DATA_BYTE), row)
+    for key, knob in config.knobs.items():
+        if knob[1] > knob[2]:
+            violations.append(Violation(f'knobs[{key}].min', knob[1], 0, knob[2], row))
+    return violations
+
+
+def check(configs):
+    """Raise InvalidConfig if any of configs has violations."""
+    violations = []
+    for row, config in enumerate(configs):
+        violations += validate(config, row)
+    if violations:
+        raise InvalidConfig(violations)
+
+
+def _compile_bounds():
+    """Compile the ranges into raw byte bounds and labels for every offset of a dump."""
+    low, high, labels, shifts = [], [], [], []
+    for name, _, _, width, kind in LAYOUT:
+        if kind in ('byte', 'channel'):
+            shift = 1 if kind == 'channel' else 0
+            bounds = RANGES.get(name, DATA_BYTE)
+            low.append(bounds[0] - shift)
+            high.append(bounds[1] - shift)
+            labels.append(name)
+            shifts.append(shift)
+            continue
+        for i in range(width):
+            if kind in RECORD_RANGES:
+                record_width = RECORD_WIDTHS[kind]
+                column, *bounds = RECORD_RANGES[kind][i % record_width]
+                labels.append(f'{name}[{i // record_width + 1}].{column}')
+            else:
+                bounds = LIST_RANGES.get(name, {}).get(i, DATA_BYTE)
+                labels.append(f'{name}[{i}]')
+            low.append(bounds[0])
+            high.append(bounds[1])
+            shifts.append(0)
+    return bytes(low), bytes(high), labels, shifts
+
+
+LOW, HIGH, LABELS, SHIFTS = _compile_bounds()
+
+
+def validate_batch(batch):
+    """Return the violations of every programme of a ProgrammeBatch in one vectorized pass."""
+    if np is None:
+        raise ImportError('numpy is required for batch processing')
+    low = np.frombuffer(LOW, dtype=np.uint8)
+    high = np.frombuffer(HIGH, dtype=np.uint8)
+    raw = batch.raw
+    violations = []
+    rows, offsets = np.nonzero((raw < low) | (raw > high))
+    for row, offset in zip(rows.tolist(), offsets.tolist()):
+        shift = SHIFTS[offset]
+        violations.append(
+            Violation(LABELS[offset], int(raw[row, offset]) + shift, LOW[offset] + shift,
+                      HIGH[offset] + shift, row))
+    knobs = batch['knobs']
+    rows, keys = np.nonzero(knobs[:, :, 1] > knobs[:, :, 2])
+    for row, key in zip(rows.tolist(), keys.tolist()):
+        violations.append(
+            Violation(f'knobs[{key + 1}].min', int(knobs[row, key, 1]), 0,
+                      int(knobs[row, key, 2]), row))
+    return sorted(violations, key=lambda violation: violation.row)
+
@@ -9,6 +9,7 @@ setup(
     author_email='https://github.com/FrozenPigs/MPK-Mini-Plus-Editor',
     url='',
     packages=['ui', 'core'],
+    python_requires='>=3.10',
     install_requires=['python-rtmidi', 'pyqt5'],
     scripts=['mpk-mini-plus-editor'],
     include_package_data=True)
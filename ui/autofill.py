@@ -371,7 +371,7 @@ class UiAutoFill(QWidget):
             direction = self.knobs_group_box.cc_start[2].currentIndex()
             direction = 1 if direction == 0 else -1
             for i in range(8):
-                conf.knobs[i + 1][0] = start_value + i * direction
+                conf.knobs[i + 1][0] = self._midi_value(start_value + i * direction)
         if do_min == Qt.CheckState.Checked:
             minimum = self.knobs_group_box.cc_min[1].value()
             for i in range(8):
@@ -401,7 +401,7 @@ class UiAutoFill(QWidget):
                 values = [n - values[0] for n in values]
             values = [n + start_note for n in values]
             for i, val in enumerate(values):
-                conf.pads[i + 1 + programme][0] = val
+                conf.pads[i + 1 + programme][0] = self._midi_value(val)
 
         conf_id = 1
         for i in [self.pads_group_box.cc, self.pads_group_box.pc]:
@@ -418,13 +418,18 @@ class UiAutoFill(QWidget):
 
         mw.fill_tab(conf, p_from)
 
+    @staticmethod
+    def _midi_value(value):
+        """Clamp value to a midi data byte, the config stores bytes."""
+        return max(0, min(127, value))
+
     def _get_spin_box_conf(self, widget, programme, conf, conf_id):
         if widget[1].checkState() == Qt.CheckState.Checked:
             value = widget[2].value()
             pc_direction = widget[3].currentIndex()
             pc_direction = 1 if pc_direction == 0 else -1
             for i in range(8):
-                conf.pads[i + 1 + programme][conf_id] = value + i * pc_direction
+                conf.pads[i + 1 + programme][conf_id] = self._midi_value(value + i * pc_direction)
         return conf
 
     def _get_combo_box_conf(self, widget, programme, conf, conf_id):
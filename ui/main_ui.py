@@ -24,21 +24,33 @@
 
 import sys
 
+from core.bank import BANK_EXTENSION, PROGRAMME_EXTENSION, read_bank, write_bank
 from core.config import Config
 from core.midi_interface import AkaiMPKPlus
+from core.shadow import DeviceShadow
+from core.syx import EXTENSION as SYX_EXTENSION
+from core.syx import read_syx, write_syx
 from PyQt6 import QtCore, QtWidgets
 from PyQt6.QtCore import QRegularExpression
 from PyQt6.QtWidgets import QGroupBox, QMessageBox
 
 from ui.autofill import UiAutoFill
 from ui.menubar import MenuBar
+from ui.midi_worker import MidiWorker
 from ui.options import Options
 from ui.programmes import Programmes
+from ui.search import UiSearch
+
+FILE_FILTER = ('MPK mini Plus files (*.mpkminiplus);;'
+               'MPK mini Plus banks (*.mpkbank);;'
+               'SysEx files (*.syx)')
 
 
 class UiMainWindow(QtWidgets.QMainWindow):
     """The main UI window."""
 
+    PORT_POLL_INTERVAL = 1000
+
     def __init__(self, *args, **kwargs):
         """Init the UI and connect to controler."""
         super().__init__(*args, **kwargs)
@@ -54,11 +66,25 @@ class UiMainWindow(QtWidgets.QMainWindow):
           }""")
 
         self.autofill_ui = UiAutoFill(self)
+        self.search_ui = UiSearch(self)
 
         self.midi = AkaiMPKPlus()
         if not self.midi.connected:
             self.show_popup_controller_not_found()
 
+        self.midi_worker = MidiWorker(self.midi, self)
+        self.shadow = DeviceShadow()
+        self.midi_worker.programme_received.connect(self.programme_received)
+        self.midi_worker.programme_sent.connect(self.shadow.update)
+        self.midi_worker.progress.connect(self.show_progress)
+        self.midi_worker.error.connect(self.show_error)
+        self.midi_worker.ports_changed.connect(self.ports_changed)
+        self.midi_worker.start()
+
+        self.port_timer = QtCore.QTimer(self)
+        self.port_timer.timeout.connect(self.midi_worker.poll_ports)
+        self.port_timer.start(self.PORT_POLL_INTERVAL)
+
         scroll_container = QtWidgets.QWidget()
         scroll_area = QtWidgets.QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -69,7 +95,7 @@ class UiMainWindow(QtWidgets.QMainWindow):
         layout.setContentsMargins(-1, -1, -1, 0)
         layout.setObjectName('main_grid_layout')
 
-        menubar = MenuBar([self.file_open, self.file_save_as], [
+        menubar = MenuBar([self.file_open, self.file_save_as, self.search_ui.show], [
             self.copy_to, self.autofill_ui.show
         ])
         self.setMenuBar(menubar)
@@ -96,16 +122,26 @@ class UiMainWindow(QtWidgets.QMainWindow):
             msg = QMessageBox()
             msg.setWindowTitle(_translate('popup', 'MPK Mini Plus Editor'))
             msg.setText(_translate('popup', 'Controller not found'))
-            msg.setIcon(QMessageBox.Warning)
-            msg.setStandardButtons(QMessageBox.Retry | QMessageBox.Close)
-            msg.setDefaultButton(QMessageBox.Retry)
+            msg.setIcon(QMessageBox.Icon.Warning)
+            msg.setStandardButtons(QMessageBox.StandardButton.Retry
+                                   | QMessageBox.StandardButton.Close)
+            msg.setDefaultButton(QMessageBox.StandardButton.Retry)
 
             ret = msg.exec()
 
-            if ret == QMessageBox.Close:
+            if ret == QMessageBox.StandardButton.Close:
                 sys.exit()
             else:
-                self.midi = AkaiMPKPlus()
+                self.midi.connected = self.midi.midi_setup()
+
+    def ports_changed(self, connected):
+        """Forget the controller state after it was plugged or unplugged."""
+        _translate = QtCore.QCoreApplication.translate
+        self.shadow.invalidate()
+        if connected:
+            self.statusBar().showMessage(_translate('main_window', 'Controller connected'))
+        else:
+            self.statusBar().showMessage(_translate('main_window', 'Controller not found'))
 
     def get_active_tab_index(self):
         """Get the current active tab."""
@@ -118,6 +154,12 @@ class UiMainWindow(QtWidgets.QMainWindow):
         prog.findChild(QGroupBox, 'pads_group_box').fill(config)
         prog.findChild(QGroupBox, 'knobs_group_box').fill(config)
 
+    def programme_received(self, config, p_i):
+        """Fill tab p_i with a config read from the controller."""
+        self.fill_tab(config, p_i)
+        if config.programme == p_i + 1:
+            self.shadow.update(self.get_tab_programme(Config(), p_i))
+
     def get_tab_programme(self, config, p_i):
         """Create a config from the programme p_i."""
         prog = self.progs[p_i]
@@ -128,114 +170,139 @@ class UiMainWindow(QtWidgets.QMainWindow):
         return config
 
     def get_all_programmes(self):
-        """Get all programmes.
-
-        Returns a list of programme configs.
-        """
-        configs = []
-        for p_i in range(0, 8):
-            config = self.get_programme(p_i + 1)
-            self.fill_tab(config, p_i)
-            configs.append(config)
-        return configs
+        """Queue fetching all programmes into their tabs."""
+        self.get_programmes({p_i + 1: p_i for p_i in range(0, 8)})
 
     def get_active_programme(self):
-        """Get current programme.
-
-        Returns a programme config.
-        """
+        """Queue fetching the current programme into the active tab."""
         p_i = self.get_active_tab_index()
-        config = self.get_programme(p_i + 1)
-        self.fill_tab(config, p_i)
-        return config
+        self.get_programmes({p_i + 1: p_i})
 
     def get_ram(self):
-        """Get current programme in RAM.
-
-        Returns a programme config.
-        """
+        """Queue fetching the programme in RAM into the active tab."""
         p_i = self.get_active_tab_index()
-        config = self.get_programme(0)
-        self.fill_tab(config, p_i)
-        return config
+        self.get_programmes({0: p_i})
 
-    def get_programme(self, p_i):
-        """Get programme p_i.
+    def get_programmes(self, tabs):
+        """Queue fetching programmes, tabs maps programme numbers to tab indexes.
 
-        Returns a programme config.
+        Tabs are filled by fill_tab once the data has arrived.
         """
-        return self.midi.get_programme(p_i)
+        self.midi_worker.get_programmes(tabs)
 
     def copy_to(self, p_to):
         """Copy programme to different tab."""
         p_from = self.get_active_tab_index()
         config = Config()
         conf = self.get_tab_programme(config, p_from)
-        conf.pad_channel += 1
-        conf.key_channel += 1
         self.fill_tab(conf, p_to - 1)
 
     def send_all_programmes(self):
-        """Send all programmes."""
-        for p_i in range(0, 8):
-            self.send_programme(p_i)
+        """Send the programmes that differ from the controller."""
+        configs = [self.get_tab_programme(Config(), p_i) for p_i in range(0, 8)]
+        configs = [config for config in configs if self.shadow.is_dirty(config)]
+        if not configs:
+            _translate = QtCore.QCoreApplication.translate
+            self.statusBar().showMessage(_translate('main_window', 'Nothing to send'))
+            return
+        self.midi_worker.send_programmes(configs)
 
     def send_active_programme(self):
         """Send currently active programme."""
         p_i = self.get_active_tab_index()
-        self.send_programme(p_i)
+        self.send_programmes([p_i])
 
-    def send_programme(self, p_i):
-        """Send p_i to correct slot."""
-        config = Config()
-        message = self.get_tab_programme(config, p_i)
-        self.midi.send_midi_message(message.serialize())
+    def send_programmes(self, p_is):
+        """Queue sending each tab in p_is to its slot."""
+        self.midi_worker.send_programmes([self.get_tab_programme(Config(), p_i) for p_i in p_is])
 
     def send_ram(self):
         """Send current prog to RAM."""
         p_i = self.get_active_tab_index()
         config = Config()
         out_message = self.get_tab_programme(config, p_i)
-        out_message.programme = 0
-        self.midi.send_midi_message(out_message.serialize())
+        self.midi_worker.send_ram(out_message)
+
+    def show_progress(self, done, total):
+        """Show midi transfer progress in the status bar."""
+        _translate = QtCore.QCoreApplication.translate
+        self.statusBar().showMessage(_translate('main_window', 'Transferred') + f' {done}/{total}')
+
+    def show_error(self, message):
+        """Show a midi transfer or file error in the status bar."""
+        self.statusBar().showMessage(message)
+
+    def closeEvent(self, event):    # pylint: disable=invalid-name
+        """Stop the midi worker before closing."""
+        self.midi_worker.stop()
+        super().closeEvent(event)
 
     def load_mpkminiplus(self, filepath):
-        """Load a config file."""
+        """Load a config file into the active tab."""
         print('Loading', filepath)
+        config = Config()
         with open(filepath, 'rb') as f:
-            conf = [int(i) for i in f.read()]
-            config = Config()
-            config.parse_config(conf)
-            self.fill_tab(config, self.get_active_tab_index())
+            config.parse_config(f.read())
+        self.fill_tab(config, self.get_active_tab_index())
 
     def save_mpkminiplus(self, filepath):
-        """Save a config file."""
+        """Save the active tab to a config file."""
         print('Saving', filepath)
         config = Config()
         conf = self.get_tab_programme(config, self.get_active_tab_index())
         with open(filepath, 'wb') as f:
-            for b in conf.serialize():
-                f.write(b.to_bytes(1, 'little'))
+            f.write(conf.tobytes())
+
+    def load_bank(self, filepath):
+        """Load a bank or .syx file into the tabs of its programmes.
+
+        RAM and slots the controller does not have are skipped. Raises OSError
+        or ValueError if the file cannot be read or holds no programme.
+        """
+        print('Loading', filepath)
+        configs = read_syx(filepath) if filepath.endswith(SYX_EXTENSION) else read_bank(filepath)
+        if not configs:
+            raise ValueError('no programmes found')
+        for slot, config in configs.items():
+            if 1 <= slot <= len(self.progs):
+                self.fill_tab(config, slot - 1)
+
+    def save_bank(self, filepath):
+        """Save every tab to a bank or .syx file."""
+        print('Saving', filepath)
+        configs = {p_i + 1: self.get_tab_programme(Config(), p_i) for p_i in range(0, 8)}
+        if filepath.endswith(SYX_EXTENSION):
+            write_syx(filepath, configs)
+        else:
+            write_bank(filepath, configs)
 
     def file_open(self):
-        """Open a saved config file."""
-        filename = QtWidgets.QFileDialog.getOpenFileName(None, 'Open file…', '',
-                                                         'MPK mini Plus files (*.mpkminiplus)')
+        """Open a saved config or bank file."""
+        filename = QtWidgets.QFileDialog.getOpenFileName(None, 'Open file…', '', FILE_FILTER)
         if filename:
-            if filename[0].endswith('.mpkminiplus'):
-                self.load_mpkminiplus(filename[0])
-            else:
-                print('Unrecognized filetype')
+            try:
+                if filename[0].endswith(PROGRAMME_EXTENSION):
+                    self.load_mpkminiplus(filename[0])
+                elif filename[0].endswith((BANK_EXTENSION, SYX_EXTENSION)):
+                    self.load_bank(filename[0])
+                else:
+                    print('Unrecognized filetype')
+            except (OSError, ValueError) as error:
+                self.show_error(f'Could not open {filename[0]}: {error}')
 
     def file_save_as(self):
-        """Save a config file."""
-        filename = QtWidgets.QFileDialog.getSaveFileName(self, 'Save file…', '',
-                                                         'MPK mini Plus files (*.mpkminiplus)')
+        """Save the active tab to a config file, or every tab to a bank file."""
+        filename = QtWidgets.QFileDialog.getSaveFileName(self, 'Save file…', '', FILE_FILTER)
         if filename:
-            if filename[0].endswith('.mpkminiplus'):
-                self.save_mpkminiplus(filename[0])
-            else:
-                print('Unrecognized filetype')
+            try:
+                if filename[0].endswith(PROGRAMME_EXTENSION):
+                    self.save_mpkminiplus(filename[0])
+                elif filename[0].endswith((BANK_EXTENSION, SYX_EXTENSION)):
+                    self.save_bank(filename[0])
+                else:
+                    print('Unrecognized filetype')
+            except OSError as error:
+                self.show_error(f'Could not save {filename[0]}: {error}')
 
     def retranslate_ui(self):
         """Create and translate all UI text elements."""
@@ -45,9 +45,14 @@ class MenuBar(QMenuBar):    # pylint: disable=too-few-public-methods
         action_save_as.triggered.connect(file_actions[1])
         menu_file.addAction(action_save_as)
 
+        action_search = QAction()
+        action_search.setObjectName('action_search')
+        action_search.triggered.connect(file_actions[2])
+        menu_file.addAction(action_search)
+
         self.addAction(menu_file.menuAction())
 
-        return (menu_file, action_open, action_save_as)
+        return (menu_file, action_open, action_save_as, action_search)
 
     def _add_edit_menu(self, edit_actions):
         menu_edit = QMenu(self)
@@ -87,6 +92,7 @@ class MenuBar(QMenuBar):    # pylint: disable=too-few-public-methods
         self._file_menu[0].setTitle(self._translate('menu', 'File'))
         self._file_menu[1].setText(self._translate('menu', 'Open'))
         self._file_menu[2].setText(self._translate('menu', 'Save as...'))
+        self._file_menu[3].setText(self._translate('menu', 'Search presets...'))
         self._edit_menu[0].setTitle(self._translate('menu', 'Edit'))
         self._edit_menu[1].setTitle(self._translate('menu', 'Copy to...'))
         for i, action in enumerate(self._edit_menu[2]):
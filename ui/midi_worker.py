@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Background worker running midi transfers off the GUI thread."""
+import queue
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class MidiWorker(QThread):
+    """Run fetches and sends for the midi interface on its own thread.
+
+    Jobs are queued and run one at a time, results come back through signals
+    so widgets are only touched on the GUI thread.
+    """
+
+    programme_received = pyqtSignal(object, int)
+    programme_sent = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+    ports_changed = pyqtSignal(bool)
+
+    def __init__(self, midi, *args, **kwargs):
+        """Init the job queue."""
+        super().__init__(*args, **kwargs)
+        self.midi = midi
+        self.jobs = queue.Queue()
+        self._poll_pending = False
+
+    def run(self):
+        """Run queued jobs until stopped."""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            function, args = job
+            try:
+                function(*args)
+            except Exception as error:    # pylint: disable=broad-except
+                self.error.emit(str(error))
+
+    def stop(self):
+        """Finish the queued jobs and stop the thread."""
+        self.jobs.put(None)
+        self.wait()
+
+    def get_programmes(self, tabs):
+        """Queue a fetch, tabs maps programme numbers to the tab they fill."""
+        self.jobs.put((self._get_programmes, (tabs, )))
+
+    def send_programmes(self, configs):
+        """Queue writing configs to their programme slots."""
+        self.jobs.put((self._send_programmes, (configs, )))
+
+    def send_ram(self, config):
+        """Queue writing config to RAM."""
+        self.jobs.put((self._send_ram, (config, )))
+
+    def poll_ports(self):
+        """Queue checking the midi ports for a plugged or unplugged controller.
+
+        Skipped while the last check is still queued behind a transfer.
+        """
+        if self._poll_pending:
+            return
+        self._poll_pending = True
+        self.jobs.put((self._poll_ports, ()))
+
+    def _poll_ports(self):
+        try:
+            if self.midi.poll_ports():
+                self.ports_changed.emit(self.midi.connected)
+        finally:
+            self._poll_pending = False
+
+    def _reconnect(self):
+        connected = self.midi.connected
+        self.midi.connected = self.midi.midi_setup()
+        if self.midi.connected != connected:
+            self.ports_changed.emit(self.midi.connected)
+
+    def _get_programmes(self, tabs):
+        self.progress.emit(0, len(tabs))
+        replies = self.midi.request_programmes(tabs.keys())
+        for done, (p_i, tab) in enumerate(tabs.items(), 1):
+            if p_i not in replies:
+                self.error.emit(f'No reply for programme {p_i}')
+                continue
+            self.programme_received.emit(self.midi.parse_programme(replies[p_i]), tab)
+            self.progress.emit(done, len(tabs))
+        if len(replies) < len(tabs):
+            self._reconnect()
+
+    def _send_programmes(self, configs):
+        self.progress.emit(0, len(configs))
+        for done, config in enumerate(configs, 1):
+            if self.midi.send_programme(config):
+                self.programme_sent.emit(config)
+            else:
+                self.error.emit(f'Could not verify programme {config.programme}')
+            self.progress.emit(done, len(configs))
+
+    def _send_ram(self, config):
+        self.progress.emit(0, 1)
+        if not self.midi.send_ram(config):
+            self.error.emit('Could not verify RAM')
+        self.progress.emit(1, 1)
@@ -247,10 +247,8 @@ class ProgrammeName(QCustomGroupBox):    # pylint: disable=too-few-public-method
     def values(self):
         """Return a dict of values from the widget."""
         name = self._name_line_edit.text()
-        if len(name) < 16:
-            name = list(map(ord, name)) + [0] * (16 - (len(name)))
-        elif len(name) >= 16:
-            name = list(map(ord, name[0:16]))
+        # the controller shows ascii, other characters become ?
+        name = list(name.encode('ascii', 'replace')[:16].ljust(16, b'\0'))
         return {'title': name}
 
 
@@ -296,8 +294,8 @@ class Channels(QCustomGroupBox):    # pylint: disable=too-few-public-methods
     def values(self):
         """Return a dict of values from the widget."""
         return {
-            'pad_channel': self._channel_pad_spin_box[1].value() - 1,
-            'key_channel': self._channel_key_spin_box[1].value() - 1,
+            'pad_channel': self._channel_pad_spin_box[1].value(),
+            'key_channel': self._channel_key_spin_box[1].value(),
             'pad_aftertouch': self._channel_pad_aftertouch_combo_box[1].currentIndex()
         }
 
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MPK-Mini-Plus-editor
+# Copyright (C) 2025  Jesse G
+# Original work derived from
+# MPK M2-editor
+# Copyright (C) 2017  Damien Picard dam.pic AT free.fr
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""UI for searching the preset catalogue."""
+
+from core.catalogue import DEFAULT_PATH, Catalogue
+from PyQt6 import QtCore
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtWidgets import (QCheckBox, QFileDialog, QHBoxLayout, QLineEdit,
+                             QListWidget, QListWidgetItem, QPushButton, QSpinBox,
+                             QVBoxLayout, QWidget)
+
+
+class IndexWorker(QThread):
+    """Run one catalogue scan off the GUI thread."""
+
+    scanned = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, function, args, *qt_args, **kwargs):
+        """Keep the scan to run, function(*args) returns a Scan."""
+        super().__init__(*qt_args, **kwargs)
+        self.function = function
+        self.args = args
+
+    def run(self):
+        """Run the scan and report its outcome."""
+        try:
+            self.scanned.emit(self.function(*self.args))
+        except Exception as error:    # pylint: disable=broad-except
+            self.error.emit(str(error))
+
+
+class UiSearch(QWidget):    # pylint: disable=too-many-instance-attributes
+    """Search the preset catalogue and load hits into the active tab."""
+
+    def _add_value_filter(self, layout, name):
+        """Add a check box enabling a midi value spin box."""
+        check_box = QCheckBox(self)
+        check_box.setObjectName(f'{name}_check_box')
+        layout.addWidget(check_box)
+        spin_box = QSpinBox(self)
+        spin_box.setObjectName(f'{name}_spin_box')
+        spin_box.setRange(0, 127)
+        layout.addWidget(spin_box)
+        return (check_box, spin_box)
+
+    def _add_push_button(self, layout, name, function):
+        push_button = QPushButton(self)
+        push_button.setObjectName(f'{name}_push_button')
+        push_button.clicked.connect(function)
+        layout.addWidget(push_button)
+        return push_button
+
+    def __init__(self, main_window, *args, catalogue_path=DEFAULT_PATH, **kwargs):
+        """Init the search widgets, the catalogue is opened on first use."""
+        super().__init__(*args, **kwargs)
+        self.setObjectName('search_main_widget')
+        self.resize(500, 400)
+        self.setWindowFlags(QtCore.Qt.WindowType.Dialog)
+        self.main_window = main_window
+        self.catalogue_path = catalogue_path
+        self._catalogue = None
+        self._refreshed = False
+        self._worker = None
+
+        layout = QVBoxLayout(self)
+        filters = QHBoxLayout()
+        self.title_line_edit = QLineEdit(self)
+        self.title_line_edit.setObjectName('title_line_edit')
+        self.title_line_edit.returnPressed.connect(self.search)
+        filters.addWidget(self.title_line_edit)
+        self.knob_cc = self._add_value_filter(filters, 'knob_cc')
+        self.pad_note = self._add_value_filter(filters, 'pad_note')
+        self.search_push_button = self._add_push_button(filters, 'search', self.search)
+        layout.addLayout(filters)
+
+        self.results = QListWidget(self)
+        self.results.setObjectName('results_list_widget')
+        self.results.itemDoubleClicked.connect(self.load)
+        layout.addWidget(self.results)
+
+        buttons = QHBoxLayout()
+        self.index_push_button = self._add_push_button(buttons, 'index', self.index_directory)
+        self.refresh_push_button = self._add_push_button(buttons, 'refresh', self.refresh)
+        self.load_push_button = self._add_push_button(buttons, 'load', self.load)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+        self.retranslate()
+
+    @property
+    def catalogue(self):
+        """Open the catalogue the first time it is needed."""
+        if self._catalogue is None:
+            self._catalogue = Catalogue(self.catalogue_path, check_same_thread=False)
+        return self._catalogue
+
+    def index_directory(self):
+        """Ask for a preset directory and add it to the catalogue."""
+        directory = QFileDialog.getExistingDirectory(self, 'Index directory…')
+        if directory:
+            self._start_scan(self.catalogue.index_directory, directory)
+
+    def refresh(self):
+        """Rescan every indexed directory."""
+        self._start_scan(self.catalogue.refresh)
+
+    def _start_scan(self, function, *args):
+        """Run a scan on a worker thread, the catalogue is left alone until it finishes."""
+        if self._worker is not None:
+            return
+        self._set_busy(True)
+        self.main_window.statusBar().showMessage('Indexing…')
+        self._worker = IndexWorker(function, args, self)
+        self._worker.scanned.connect(self._report_scan)
+        self._worker.error.connect(self.main_window.show_error)
+        self._worker.finished.connect(self._scan_finished)
+        self._worker.start()
+
+    def _scan_finished(self):
+        self._worker = None
+        self._set_busy(False)
+        self.search()
+
+    def _set_busy(self, busy):
+        for widget in (self.index_push_button, self.refresh_push_button,
+                       self.search_push_button, self.load_push_button):
+            widget.setEnabled(not busy)
+
+    def _report_scan(self, scan):
+        """Show the scan summary and the skipped paths."""
+        status_bar = self.main_window.statusBar()
+        status_bar.showMessage(str(scan))
+        status_bar.setToolTip('\n'.join(f'{path}: {error}' for path, error in scan.skipped))
+
+    def search(self):
+        """Fill the result list with the programmes matching the filters."""
+        if self._worker is not None:
+            return
+        filters = {'title': self.title_line_edit.text() or None}
+        for name, (check_box, spin_box) in (('knob_cc', self.knob_cc),
+                                            ('pad_note', self.pad_note)):
+            if check_box.isChecked():
+                filters[name] = spin_box.value()
+        self.results.clear()
+        for hit in self.catalogue.search(**filters):
+            item = QListWidgetItem(f'{hit.title}    {hit.path} [{hit.position}]')
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, hit)
+            self.results.addItem(item)
+
+    def load(self):
+        """Load the selected hit into the active tab."""
+        item = self.results.currentItem()
+        if item is None:
+            return
+        hit = item.data(QtCore.Qt.ItemDataRole.UserRole)
+        mw = self.main_window
+        try:
+            config = hit.load()
+        except (KeyError, OSError, ValueError) as error:
+            mw.show_error(f'Could not load {hit.path} [{hit.position}]: {error}')
+            return
+        mw.fill_tab(config, mw.get_active_tab_index())
+
+    def showEvent(self, event):    # pylint: disable=invalid-name
+        """Rescan the indexed directories the first time the panel opens."""
+        super().showEvent(event)
+        if not self._refreshed:
+            self._refreshed = True
+            self.refresh()
+
+    def closeEvent(self, event):    # pylint: disable=invalid-name
+        """Commit the catalogue when the panel closes."""
+        if self._worker is not None:
+            self._worker.wait()
+        if self._catalogue is not None:
+            self._catalogue.db.commit()
+        super().closeEvent(event)
+
+    def retranslate(self):
+        """Retranslate the UI."""
+        _translate = QtCore.QCoreApplication.translate
+        self.setWindowTitle(_translate('search', 'Search presets'))
+        self.title_line_edit.setPlaceholderText(_translate('search', 'Title, e.g. DRUM*'))
+        self.knob_cc[0].setText(_translate('search', 'Knob CC'))
+        self.pad_note[0].setText(_translate('search', 'Pad note'))
+        self.search_push_button.setText(_translate('search', 'Search'))
+        self.index_push_button.setText(_translate('search', 'Index directory...'))
+        self.refresh_push_button.setText(_translate('search', 'Refresh'))
+        self.load_push_button.setText(_translate('search', 'Load into tab'))